@@ -1,42 +1,66 @@
+import asyncio
+import hashlib
 from typing import Optional
 
 from app.api.svc_container import service_container
+from app.config.config import settings
 from app.infra.message_parser import MessageParser
+from app.infra.single_flight import SingleFlight, normalize_query
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 router = APIRouter()
 
-vector_store = service_container.vector_store
+vector_store = service_container.async_vector_store
 llm_service = service_container.llm_service
 speech_style_converter = service_container.speech_style_converter
+style_profiler = service_container.style_profiler
+hybrid_retriever = service_container.hybrid_retriever
+convert_flight = SingleFlight("convert")
 
 
 class ConvertSpeechStyleRequest(BaseModel):
     query: str
     context_messages: Optional[str] = None
 
+async def _convert(query: str, context_messages_str: Optional[str], collection_name: Optional[str]) -> dict:
+    # 스타일 프로필이 있으면 쿼리별 유사 발화는 소수만 검색합니다.
+    style_profile = style_profiler.get(collection_name)
+    top_k = settings.STYLE_PROFILE_NEIGHBORS if style_profile else 20
+    results = await hybrid_retriever.search(query, top_k, collection_name)
+    context_messages = []
+    if context_messages_str:
+        context_messages = MessageParser.from_str(context_messages_str)
+
+    for msg in context_messages:
+        print(msg)
+
+    return await asyncio.to_thread(
+        speech_style_converter.convert,
+        target_sentence=query, 
+        similar_utterances=[msg.content for msg, _ in results],
+        context_messages=context_messages,
+        style_profile=style_profile
+        )
+
 @router.post("/convert")
 async def convert_speech_style(req: ConvertSpeechStyleRequest):
     try:
-        results = vector_store.search(req.query, 20)
-        context_messages = []
-        if req.context_messages:
-            context_messages = MessageParser.from_str(req.context_messages)
-
-        for msg in context_messages:
-            print(msg)
-
-        converted_sentence = speech_style_converter.convert(
-            target_sentence=req.query, 
-            similar_utterances=[msg.content for msg, _ in results],
-            context_messages=context_messages
-            )
+        # 동일한 요청이 동시에 들어오면 하나의 계산 결과를 공유합니다.
+        collection_name = vector_store.get_loaded_collection()
+        context_hash = hashlib.sha1((req.context_messages or "").encode("utf-8")).hexdigest()
+        key = (collection_name, normalize_query(req.query), context_hash)
+        converted_sentence = await convert_flight.do(
+            key,
+            lambda: _convert(req.query, req.context_messages, collection_name)
+        )
         
         return {
             "status": "success",
             "converted": converted_sentence
         }
         
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store search timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
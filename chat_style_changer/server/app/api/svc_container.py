@@ -1,16 +1,41 @@
+from app.config.config import settings
+from app.infra.async_vector_store import AsyncVectorStore
+from app.infra.lexical_index import LexicalIndexStore
 from app.infra.llm import LLMService
 from app.infra.message_parser import MessageParser
 from app.infra.vector_store import VectorStore
+from app.infra.watermark_store import WatermarkStore
 from app.services.async_vector_loader import AsyncVectorLoader
+from app.services.collection_snapshot import CollectionSnapshot
+from app.services.dedup_index_store import DedupIndexStore
+from app.services.deduplicator import Deduplicator
+from app.services.hybrid_retriever import HybridRetriever
+from app.services.model_router import ModelRouter
 from app.services.speech_style_converter import SpeechStyleConverter
+from app.services.style_profiler import StyleProfiler
 
 
 class ServiceContainer:
     def __init__(self):
         self.vector_store = VectorStore()
-        self.vector_loader = AsyncVectorLoader(self.vector_store)
+        self.async_vector_store = AsyncVectorStore(self.vector_store)
+        self.lexical_store = LexicalIndexStore()
+        self.hybrid_retriever = HybridRetriever(self.async_vector_store, self.lexical_store)
+        self.style_profiler = StyleProfiler(self.vector_store)
+        self.watermark_store = WatermarkStore()
+        self.dedup_store = DedupIndexStore()
+        self.vector_loader = AsyncVectorLoader(
+            self.async_vector_store,
+            self.style_profiler,
+            deduplicator=Deduplicator() if settings.DEDUP_ENABLED else None,
+            dedup_store=self.dedup_store,
+            watermark_store=self.watermark_store,
+            lexical_store=self.lexical_store
+        )
+        self.collection_snapshot = CollectionSnapshot(self.vector_store, self.lexical_store, self.style_profiler)
         self.llm_service = LLMService()
-        self.speech_style_converter = SpeechStyleConverter(self.llm_service)
+        self.model_router = ModelRouter(self.llm_service)
+        self.speech_style_converter = SpeechStyleConverter(self.llm_service, self.model_router)
     
 
 service_container = ServiceContainer()
\ No newline at end of file
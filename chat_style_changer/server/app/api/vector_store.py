@@ -1,28 +1,39 @@
+import asyncio
 import json
 from typing import Optional
 
 from app.api.svc_container import service_container
 from app.infra.message_parser import MessageParser
+from app.infra.single_flight import SingleFlight, normalize_query
 from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/vector-store")
-vector_store = service_container.vector_store
+vector_store = service_container.async_vector_store
 vector_loader = service_container.vector_loader
+style_profiler = service_container.style_profiler
+collection_snapshot = service_container.collection_snapshot
+watermark_store = service_container.watermark_store
+dedup_store = service_container.dedup_store
+lexical_store = service_container.lexical_store
+hybrid_retriever = service_container.hybrid_retriever
+search_flight = SingleFlight("search")
 
 
 @router.get("/collections")
 async def get_collections():
     """Get all collections in the vector store."""
     try:
-        collections = vector_store.get_collections()
+        collections = await vector_store.get_collections()
 
         return {
             "status": "success",
             "collections": collections
         }
 
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -48,13 +59,15 @@ async def load_collection(
 ):
     """Load a collection to Memory."""
     try:
-        vector_store.load_collection(name)
+        await vector_store.load_collection(name)
 
         return {
             "status": "success",
             "collection_name": name
         }
     
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))    
 
@@ -65,14 +78,16 @@ async def create_collection(
 ):
     """Create a new collection in the vector store."""
     try:
-        vector_store.create_collection(name)
-        collections = vector_store.get_collections()
+        await vector_store.create_collection(name)
+        collections = await vector_store.get_collections()
 
         return {
             "status": "success",
             "collections": collections
         }
     
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -83,14 +98,69 @@ async def drop_collection(
 ):
     """Drop a collection from the vector store."""
     try:
-        vector_store.drop_collection(name)
-        collections = vector_store.get_collections()
+        await vector_store.drop_collection(name)
+        style_profiler.delete(name)
+        watermark_store.delete(name)
+        dedup_store.delete(name)
+        lexical_store.delete(name)
+        collections = await vector_store.get_collections()
         
         return {
             "status": "success",
             "collections": collections
         }
         
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/collections:export")
+async def export_collection(
+    name: str = Query(..., description="Collection name to export"),
+    snapshot: str = Query(..., description="Snapshot name to write")
+):
+    """Export a collection's embeddings and metadata to a local snapshot."""
+    try:
+        manifest = await vector_store.run_admin(collection_snapshot.export, name, snapshot)
+
+        return {
+            "status": "success",
+            "snapshot": snapshot,
+            "manifest": manifest
+        }
+
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/collections:import")
+async def import_collection(
+    name: str = Query(..., description="Collection name to import into"),
+    snapshot: str = Query(..., description="Snapshot name to read"),
+    append: bool = Query(False, description="Import into a collection that already has entities")
+):
+    """Import a local snapshot into a collection without re-embedding."""
+    try:
+        manifest = await vector_store.run_admin(collection_snapshot.import_, snapshot, name, append)
+        # The dedup table is backfilled from the collection on the next load
+        dedup_store.delete(name)
+
+        return {
+            "status": "success",
+            "collection_name": name,
+            "manifest": manifest
+        }
+
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -100,23 +170,30 @@ async def load_vectors(
     collection_name: str = Form(...),
     user_name: str = Form(...),
     size: int = Form(None),
+    incremental: bool = Form(False),
     csv_file: UploadFile = File(...)
 ):
     """Load messages from a CSV file in the resources directory and store them in the vector store.
     
     Args:
         request: Request body containing file_name and optional size
+        incremental: Only load messages newer than the chatroom's watermark in this collection
         
     Returns:
         StreamingResponse: Server-sent events with progress updates
     """
     try:
-        # Parse messages from CSV
-        messages = await MessageParser.extract_user_messages(csv_file, user_name)
+        # Parse messages from CSV, skipping already loaded ones in incremental mode.
+        # The loader checks the watermark again under the collection's load lock
+        watermark = None
+        if incremental:
+            chatroom_id = MessageParser.chatroom_id_from_filename(csv_file.filename)
+            watermark = watermark_store.get(collection_name, chatroom_id)
+        messages = await MessageParser.extract_user_messages(csv_file, user_name, watermark)
         
         # Use AsyncVectorLoader to process messages with progress tracking
         async def event_generator():
-            async for progress in vector_loader.load_messages(collection_name, messages):
+            async for progress in vector_loader.load_messages(collection_name, messages, incremental):
                 yield f"data: {json.dumps(progress)}\n\n"
         
         return StreamingResponse(
@@ -128,13 +205,73 @@ async def load_vectors(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/collections/style-profile:build")
+async def build_style_profile(
+    name: str = Query(..., description="Collection name to build the style profile for")
+):
+    """Build the style profile of a collection from its stored embeddings."""
+    try:
+        profile = await asyncio.to_thread(style_profiler.build, name)
+
+        return {
+            "status": "success",
+            "style_profile": profile
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/collections/lexical-index:build")
+async def build_lexical_index(
+    name: str = Query(..., description="Collection name to build the lexical index for")
+):
+    """Rebuild the lexical index of a collection from its stored messages (e.g. to backfill an existing collection)."""
+    try:
+        count = await vector_store.run_admin(
+            lexical_store.rebuild, name, vector_store.vector_store.iter_messages(name)
+        )
+
+        return {
+            "status": "success",
+            "collection_name": name,
+            "indexed": count
+        }
+
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/collections/style-profile")
+async def get_style_profile(
+    name: str = Query(..., description="Collection name to get the style profile of")
+):
+    """Get the cached style profile of a collection."""
+    try:
+        profile = style_profiler.get(name)
+        if profile is None:
+            raise HTTPException(status_code=404, detail=f"Style profile not found: {name}")
+
+        return {
+            "status": "success",
+            "style_profile": profile
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/collections/vectors:count")
 async def get_vector_store_count(
     name: str = Query(..., description="Collection name to get count from")
 ):
     """Get the number of messages in the vector store."""
     try:
-        count = vector_store.get_count(name)
+        count = await vector_store.get_count(name)
         
         return {
             "status": "success",
@@ -142,25 +279,33 @@ async def get_vector_store_count(
             "count": count
         }
         
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get(":search")
 async def search_messages(
     query: str = Query(..., description="User query string to convert style"),
-    top_k: int = Query(5, ge=1, le=50, description="Number of similar results to return (default: 5)")
+    top_k: int = Query(5, ge=1, le=50, description="Number of similar results to return (default: 5)"),
+    mode: str = Query("vector", pattern="^(hybrid|vector|lexical)$", description="Retrieval mode (default: vector)")
 ):
     """Search for messages similar to the query.
     
     Args:
         query: User query string to convert style
+        mode: "vector", "lexical" (BM25, no embedding) or "hybrid" (rank fusion of both)
         
     Returns:
         dict: List of similar messages with their scores
     """
     try:
-        # Search for similar messages
-        results = vector_store.search(query, top_k)
+        # Search for similar messages, sharing the result with identical concurrent searches
+        collection_name = vector_store.get_loaded_collection()
+        results = await search_flight.do(
+            (collection_name, normalize_query(query), top_k, mode),
+            lambda: hybrid_retriever.search(query, top_k, collection_name, mode)
+        )
         
         # Format results
         messages = []
@@ -168,16 +313,20 @@ async def search_messages(
             messages.append({
                 "content": message.content,
                 "timestamp": message.timestamp,
+                "frequency": message.frequency,
                 "score": score
             })
         
         return {
             "status": "success",
-            "collection_name": vector_store.loaded_collection._name,
+            "collection_name": collection_name,
             "query": query,
             "top_k": top_k,
+            "mode": mode,
             "messages": messages
         }
         
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Vector store operation timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -16,18 +16,81 @@ class Settings(BaseSettings):
     # MODEL_NAME: str = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
     # MODEL_DIM: int = 768
 
+    # Embedding Server Settings
+    # 설정하면 워커들이 모델을 직접 로드하지 않고 이 Unix 소켓의 임베딩 서버를 공유합니다.
+    EMBEDDING_SERVER_SOCKET: str = os.getenv("EMBEDDING_SERVER_SOCKET", "")
+    EMBEDDING_SERVER_MAX_BATCH: int = 256
+    EMBEDDING_SERVER_MAX_WAIT_MS: int = 5
+    EMBEDDING_SERVER_TIMEOUT: float = 30.0
+    # 임베딩 서버에 연결할 수 없을 때 다시 ping 하기까지 기다리는 시간(초), 실패할 때마다 두 배로 늘어납니다.
+    EMBEDDING_SERVER_RETRY_BACKOFF: float = 1.0
+    EMBEDDING_SERVER_MAX_RETRY_BACKOFF: float = 60.0
+
+    # Ingestion Dedup Settings
+    DEDUP_ENABLED: bool = True
+    DEDUP_SIMHASH_MAX_DISTANCE: int = 3
+    # 이보다 짧은 메시지는 정규화 후 완전 일치로만 중복 제거합니다.
+    DEDUP_SIMHASH_MIN_LENGTH: int = 8
+    # 컬렉션별 중복 제거 테이블(정규화 문장 digest, SimHash -> 대표 메시지 primary key)을 저장하는 디렉터리
+    DEDUP_INDEX_DIR: str = os.getenv("DEDUP_INDEX_DIR", ".dedup_index")
+
+    # Ingestion Batching Settings
+    # 배치 크기(메시지 수) * 배치 내 최장 토큰 길이의 상한
+    EMBEDDING_MAX_BATCH_TOKENS: int = 8192
+
     # Milvus Settings
     MILVUS_HOST: str = os.getenv("MILVUS_HOST", "localhost")
     MILVUS_PORT: int = int(os.getenv("MILVUS_PORT", "19530"))
 
-    MILVUS_URL: str = "https://in03-f14be7815686ef7.serverless.gcp-us-west1.cloud.zilliz.com"
+    # 로컬 파일 경로(예: ./milvus.db)를 지정하면 Milvus Lite를 사용합니다.
+    MILVUS_URL: str = os.getenv("MILVUS_URL", "https://in03-f14be7815686ef7.serverless.gcp-us-west1.cloud.zilliz.com")
     MILVUS_TOKEN: str = os.getenv("MILVUS_TOKEN", "")
+    # 검색과 관리 작업(load, insert, flush, drop)은 서로 다른 스레드 풀에서 실행됩니다.
+    VECTOR_STORE_SEARCH_WORKERS: int = 8
+    VECTOR_STORE_ADMIN_WORKERS: int = 2
+    VECTOR_STORE_SEARCH_TIMEOUT: float = 10.0
+    VECTOR_STORE_ADMIN_TIMEOUT: float = 600.0
     
+    # Style Profile Settings
+    STYLE_PROFILE_DIR: str = os.getenv("STYLE_PROFILE_DIR", ".style_profiles")
+    STYLE_PROFILE_CLUSTERS: int = 8
+    STYLE_PROFILE_EXEMPLARS_PER_CLUSTER: int = 2
+    STYLE_PROFILE_MAX_SAMPLES: int = 20000
+    # 업로드 후 컬렉션이 이 비율 이상 커졌을 때만 백그라운드에서 프로필을 다시 만듭니다.
+    STYLE_PROFILE_REBUILD_GROWTH: float = 0.1
+    # 스타일 프로필이 있는 경우 요청마다 검색할 유사 발화 수
+    STYLE_PROFILE_NEIGHBORS: int = 5
+
+    # Incremental Ingestion Settings
+    WATERMARK_DIR: str = os.getenv("WATERMARK_DIR", ".watermarks")
+
+    # Hybrid Retrieval Settings
+    LEXICAL_INDEX_DIR: str = os.getenv("LEXICAL_INDEX_DIR", ".lexical_index")
+    # Reciprocal rank fusion constant
+    HYBRID_RRF_K: int = 60
+    # 벡터 검색이 이 시간(초) 안에 끝나지 않으면 lexical 결과만 사용합니다.
+    HYBRID_VECTOR_TIMEOUT: float = 2.0
+
+    # Snapshot Settings
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", ".snapshots")
+    SNAPSHOT_IMPORT_CHUNK: int = 5000
+
     # ChromaDB Settings
     CHROMA_PERSIST_DIRECTORY: str = ".chroma"
     
     # API Keys (if needed)
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+
+    # LLM Settings
+    # OPENAI_BASE_URL을 지정하면 로컬 stub 모델 서버로 요청을 보낼 수 있습니다.
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")
+    LLM_FAST_MODEL: str = os.getenv("LLM_FAST_MODEL", "gpt-4.1-mini-2025-04-14")
+    LLM_STRONG_MODEL: str = os.getenv("LLM_STRONG_MODEL", "gpt-4.1-2025-04-14")
+    # 이 길이(문자 수) 이상의 입력 문장은 처음부터 큰 모델로 보냅니다.
+    LLM_LONG_INPUT_CHARS: int = int(os.getenv("LLM_LONG_INPUT_CHARS", "200"))
+    # 변환 결과 길이 / 원문 길이 허용 범위 (뜻 보존 검사)
+    LLM_MIN_LENGTH_RATIO: float = float(os.getenv("LLM_MIN_LENGTH_RATIO", "0.3"))
+    LLM_MAX_LENGTH_RATIO: float = float(os.getenv("LLM_MAX_LENGTH_RATIO", "3.0"))
     
     class Config:
         case_sensitive = True
@@ -0,0 +1,127 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from app.config.config import settings
+from app.models.message import Message
+
+from .embedding import EmbeddingService
+from .vector_store import VectorStore
+
+
+class AsyncVectorStore:
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        search_workers: int = settings.VECTOR_STORE_SEARCH_WORKERS,
+        admin_workers: int = settings.VECTOR_STORE_ADMIN_WORKERS,
+        search_timeout: float = settings.VECTOR_STORE_SEARCH_TIMEOUT,
+        admin_timeout: float = settings.VECTOR_STORE_ADMIN_TIMEOUT
+    ):
+        """
+        Async facade over VectorStore for use from the event loop.
+
+        Searches and admin operations run on separate bounded thread pools (and
+        separate Milvus connections), so a slow load, drop or flush never blocks
+        the event loop or search traffic.
+
+        Args:
+            vector_store: VectorStore to delegate to
+            search_workers: Maximum concurrent search RPCs
+            admin_workers: Maximum concurrent admin RPCs
+            search_timeout: Default timeout in seconds for searches
+            admin_timeout: Default timeout in seconds for admin operations
+        """
+        self.vector_store = vector_store
+        self.search_executor = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix="vs-search")
+        self.admin_executor = ThreadPoolExecutor(max_workers=admin_workers, thread_name_prefix="vs-admin")
+        self.search_workers = search_workers
+        self.search_timeout = search_timeout
+        self.admin_timeout = admin_timeout
+        self.search_in_flight = 0
+
+    def is_search_saturated(self) -> bool:
+        """Check whether every search worker is busy, so a new search would queue."""
+        return self.search_in_flight >= self.search_workers
+
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        return self.vector_store.embedding_service
+
+    def get_loaded_collection(self) -> Optional[str]:
+        """Get the loaded collection name (no RPC)."""
+        return self.vector_store.get_loaded_collection()
+
+    async def get_collections(self, timeout: Optional[float] = None) -> List[Tuple[str, int]]:
+        return await self._run_admin(timeout, self.vector_store.get_collections)
+
+    async def get_count(self, collection_name: str, timeout: Optional[float] = None) -> int:
+        return await self._run_admin(timeout, self.vector_store.get_count, collection_name)
+
+    async def load_collection(self, collection_name: str, timeout: Optional[float] = None):
+        await self._run_admin(timeout, self.vector_store.load_collection, collection_name)
+
+    async def create_collection(self, collection_name: str, timeout: Optional[float] = None):
+        await self._run_admin(timeout, self.vector_store.create_collection, collection_name)
+
+    async def drop_collection(self, collection_name: str, timeout: Optional[float] = None):
+        await self._run_admin(timeout, self.vector_store.drop_collection, collection_name)
+
+    async def add(
+        self,
+        collection_name: str,
+        messages: List[Message],
+        embeddings: np.ndarray,
+        flush: bool = True,
+        timeout: Optional[float] = None
+    ) -> List[int]:
+        return await self._run_admin(timeout, self.vector_store.add, collection_name, messages, embeddings, flush)
+
+    async def add_frequencies(
+        self,
+        collection_name: str,
+        increments: Dict[int, int],
+        timeout: Optional[float] = None
+    ) -> Dict[int, int]:
+        return await self._run_admin(timeout, self.vector_store.add_frequencies, collection_name, increments)
+
+    async def delete(self, collection_name: str, ids: List[int], timeout: Optional[float] = None):
+        await self._run_admin(timeout, self.vector_store.delete, collection_name, ids)
+
+    async def flush(self, collection_name: str, timeout: Optional[float] = None):
+        await self._run_admin(timeout, self.vector_store.flush, collection_name)
+
+    async def run_admin(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Run a blocking call that talks to the vector store (e.g. a snapshot import) on the admin pool."""
+        return await self._run_admin(timeout, fn, *args)
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        timeout: Optional[float] = None
+    ) -> List[Tuple[Message, float]]:
+        timeout = timeout or self.search_timeout
+        self.search_in_flight += 1
+        try:
+            return await self._run(
+                self.search_executor, timeout, partial(self.vector_store.search, query, top_k, timeout=timeout)
+            )
+        finally:
+            self.search_in_flight -= 1
+
+    async def _run_admin(self, timeout: Optional[float], fn: Callable, *args) -> Any:
+        return await self._run(self.admin_executor, timeout or self.admin_timeout, partial(fn, *args))
+
+    async def _run(self, executor: ThreadPoolExecutor, timeout: float, fn: Callable) -> Any:
+        """
+        Run a blocking call on the executor with a timeout.
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish in time. The worker
+                thread finishes the RPC in the background.
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(loop.run_in_executor(executor, fn), timeout)
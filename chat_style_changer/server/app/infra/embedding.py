@@ -1,17 +1,127 @@
+import logging
+import threading
+import time
 from typing import List
 
+import numpy as np
 from app.config.config import settings
-from sentence_transformers import SentenceTransformer
+
+from .embedding_server import EmbeddingClient, encode_normalized
+
+logger = logging.getLogger(__name__)
 
 
 class EmbeddingService:
-    def __init__(self, model_name: str = settings.MODEL_NAME):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str = settings.MODEL_NAME,
+        server_socket: str = settings.EMBEDDING_SERVER_SOCKET,
+        retry_backoff: float = settings.EMBEDDING_SERVER_RETRY_BACKOFF,
+        max_retry_backoff: float = settings.EMBEDDING_SERVER_MAX_RETRY_BACKOFF
+    ):
+        """
+        Initialize EmbeddingService.
+
+        With a server socket, embeddings come from the shared embedding server.
+        While it is unreachable, requests are served by an in-process model that
+        is loaded on demand and released once the server answers a ping again.
+
+        Args:
+            model_name: SentenceTransformer model to use in-process
+            server_socket: Unix socket path of the embedding server (in-process only if empty)
+            retry_backoff: Seconds to wait before pinging an unreachable server again
+            max_retry_backoff: Upper bound for the exponential retry backoff
+        """
+        self.model_name = model_name
+        self.model = None
+        self.client = EmbeddingClient(server_socket) if server_socket else None
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._model_lock = threading.Lock()
+        self._server_lock = threading.Lock()
+        self._server_down = False
+        self._current_backoff = retry_backoff
+        self._retry_at = 0.0
+
+        if self.client is None:
+            self._load_model()
+        elif self.client.ping():
+            logger.info(f"Using shared embedding server at {server_socket}")
+        else:
+            logger.warning(f"Embedding server at {server_socket} is unavailable, falling back to in-process model")
+            self._mark_server_down()
+
+    def get_embedding(self, text: str) -> np.ndarray:
+        """Get L2-normalized float32 embedding for a single text."""
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get L2-normalized float32 embeddings for multiple texts as a (n, dim) array."""
+        if self.client is not None and self._server_available():
+            try:
+                return self.client.encode(texts)
+            except (FileNotFoundError, ConnectionError) as e:
+                logger.warning(f"Embedding server is unreachable, falling back to in-process model: {str(e)}")
+                self._mark_server_down()
+            # A timeout (socket.timeout) propagates: the server is up but busy, and loading
+            # a model copy in every worker is the memory growth the server exists to avoid
+
+        return encode_normalized(self._load_model(), texts)
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """
+        Get the token length of each text as seen by the encoder.
+
+        Falls back to character counts when the model is hosted by the embedding server.
+        """
+        if not texts:
+            return []
+        model = self.model
+        if model is None:
+            return [len(text) for text in texts]
+
+        encoded = model.tokenizer(
+            texts,
+            add_special_tokens=True,
+            truncation=True,
+            max_length=model.max_seq_length
+        )
+        return [len(input_ids) for input_ids in encoded["input_ids"]]
+
+    def _server_available(self) -> bool:
+        """Check whether requests should go to the embedding server, pinging it after a backoff."""
+        with self._server_lock:
+            if not self._server_down:
+                return True
+            if time.monotonic() < self._retry_at:
+                return False
+            # Only one thread pings per backoff window
+            self._retry_at = time.monotonic() + self._current_backoff
+
+        if not self.client.ping():
+            self._mark_server_down()
+            return False
+
+        with self._server_lock:
+            self._server_down = False
+            self._current_backoff = self.retry_backoff
+        logger.info("Embedding server is reachable again, releasing in-process model")
+        with self._model_lock:
+            self.model = None
+        return True
+
+    def _mark_server_down(self):
+        with self._server_lock:
+            if self._server_down:
+                self._current_backoff = min(self._current_backoff * 2, self.max_retry_backoff)
+            self._server_down = True
+            self._retry_at = time.monotonic() + self._current_backoff
 
-    def get_embedding(self, text: str) -> List[float]:
-        """Get embedding for a single text."""
-        return self.model.encode(text).tolist()
+    def _load_model(self):
+        with self._model_lock:
+            if self.model is None:
+                # Imported lazily so thin clients of the embedding server never load torch
+                from sentence_transformers import SentenceTransformer
 
-    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings for multiple texts."""
-        return self.model.encode(texts).tolist()
+                self.model = SentenceTransformer(self.model_name)
+            return self.model
@@ -0,0 +1,208 @@
+"""
+Shared embedding model server.
+
+A single process per node loads the embedding model and serves embeddings to
+every API worker over a local Unix socket. Requests arriving from different
+workers within a short window are encoded together in one batch.
+
+Wire format (both directions): a 4-byte big-endian length followed by a JSON
+header. Requests are `{"texts": [...]}`. Responses are `{"shape": [n, dim]}`
+followed by n * dim L2-normalized float32 values, or `{"error": "..."}`.
+
+Run with:
+    EMBEDDING_SERVER_SOCKET=/tmp/embedding.sock python -m app.infra.embedding_server
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+from typing import List, Optional, Tuple
+
+import numpy as np
+from app.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct(">I")
+
+
+def encode_normalized(model, texts: List[str]) -> np.ndarray:
+    """Encode texts into a contiguous (n, dim) float32 array of L2-normalized embeddings."""
+    embeddings = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+def pack_message(header: dict, payload: bytes = b"") -> bytes:
+    """Encode a length-prefixed JSON header followed by a raw payload."""
+    encoded = json.dumps(header).encode("utf-8")
+    return HEADER.pack(len(encoded)) + encoded + payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("Embedding server closed the connection")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+class EmbeddingClient:
+    def __init__(self, socket_path: str, timeout: float = settings.EMBEDDING_SERVER_TIMEOUT):
+        """
+        Initialize EmbeddingClient.
+
+        Args:
+            socket_path: Unix socket path of the embedding server
+            timeout: Socket timeout in seconds for a single request
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def ping(self) -> bool:
+        """Check whether the embedding server is reachable. A server too busy to answer in time counts as up."""
+        try:
+            self.encode([])
+        except TimeoutError:
+            return True
+        except (FileNotFoundError, ConnectionError, ValueError):
+            return False
+        return True
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts on the embedding server."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(pack_message({"texts": texts}))
+
+            (length,) = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+            header = json.loads(_recv_exactly(sock, length))
+            if "error" in header:
+                raise ValueError(f"Embedding server error: {header['error']}")
+
+            n, dim = header["shape"]
+            payload = _recv_exactly(sock, n * dim * 4)
+            return np.frombuffer(payload, dtype=np.float32).reshape(n, dim)
+
+
+class EmbeddingServer:
+    def __init__(
+        self,
+        socket_path: str,
+        model_name: str = settings.MODEL_NAME,
+        max_batch: int = settings.EMBEDDING_SERVER_MAX_BATCH,
+        max_wait_ms: int = settings.EMBEDDING_SERVER_MAX_WAIT_MS
+    ):
+        """
+        Initialize EmbeddingServer.
+
+        Args:
+            socket_path: Unix socket path to listen on
+            model_name: SentenceTransformer model to host
+            max_batch: Maximum number of texts encoded in one batch
+            max_wait_ms: How long to wait for more requests before encoding a batch
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self.socket_path = socket_path
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+
+    async def serve(self):
+        """Start serving requests until cancelled."""
+        self.queue = asyncio.Queue()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path)
+        batcher = asyncio.create_task(self.run_batcher())
+        logger.info(f"Embedding server listening on {self.socket_path}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    (length,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+                except asyncio.IncompleteReadError:
+                    break
+
+                request = json.loads(await reader.readexactly(length))
+                texts = request.get("texts", [])
+                try:
+                    embeddings = await self.submit(texts)
+                    writer.write(pack_message({"shape": list(embeddings.shape)}, embeddings.tobytes()))
+                except Exception as e:
+                    logger.error(f"Error encoding {len(texts)} texts: {str(e)}")
+                    writer.write(pack_message({"error": str(e)}))
+                await writer.drain()
+
+        finally:
+            writer.close()
+
+    async def submit(self, texts: List[str]) -> np.ndarray:
+        """Queue texts for the next batch and wait for their embeddings."""
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+
+    async def run_batcher(self):
+        """Collect queued requests into batches and encode them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending: List[Tuple[List[str], asyncio.Future]] = [await self.queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            texts = [text for request_texts, _ in pending for text in request_texts]
+            try:
+                embeddings = await loop.run_in_executor(None, self.encode, texts)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for request_texts, future in pending:
+                if not future.done():
+                    future.set_result(embeddings[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return encode_normalized(self.model, texts)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if not settings.EMBEDDING_SERVER_SOCKET:
+        raise SystemExit("EMBEDDING_SERVER_SOCKET must be set")
+    asyncio.run(EmbeddingServer(settings.EMBEDDING_SERVER_SOCKET).serve())
@@ -0,0 +1,53 @@
+import fcntl
+import os
+
+
+class FileLock:
+    def __init__(self, path: str):
+        """
+        Exclusive advisory lock on a file, shared by every process on the host.
+
+        Locks are taken with flock on a dedicated lock file, so they also exclude
+        other threads of the same process that open their own FileLock.
+
+        Args:
+            path: Path of the lock file (created if missing)
+        """
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        """Block until the lock is held."""
+        self._lock(fcntl.LOCK_EX)
+
+    def try_acquire(self) -> bool:
+        """Take the lock if it is free, without blocking."""
+        try:
+            self._lock(fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def release(self):
+        """Release the lock."""
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def _lock(self, operation: int):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        f = open(self.path, "a")
+        try:
+            fcntl.flock(f.fileno(), operation)
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
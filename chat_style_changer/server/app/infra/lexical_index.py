@@ -0,0 +1,249 @@
+import itertools
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config.config import settings
+from app.models.message import Message
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl"
+# Control characters rather than "^"/"$", which appear in messages ("^^")
+TOKEN_START = "\x02"
+TOKEN_END = "\x03"
+
+
+def char_ngrams(text: str, n: int = 2) -> List[str]:
+    """
+    Character n-grams of each whitespace-separated token of a normalized text.
+
+    Tokens are wrapped in boundary markers, so one-character tokens such as an
+    emoji ("고마워 😊") still produce grams and match a query for the token alone.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    grams = []
+    for token in text.split():
+        token = f"{TOKEN_START}{token}{TOKEN_END}"
+        grams.extend(token[i:i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+class LexicalIndex:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        In-memory character n-gram inverted index with BM25 scoring.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.messages: List[Message] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.total_length = 0
+        self._lock = threading.Lock()
+
+    def add(self, messages: List[Message]):
+        """Index messages."""
+        with self._lock:
+            for msg in messages:
+                doc_id = len(self.messages)
+                grams = Counter(char_ngrams(msg.content))
+                for gram, tf in grams.items():
+                    self.postings[gram][doc_id] = tf
+                length = sum(grams.values())
+                self.messages.append(msg)
+                self.lengths.append(length)
+                self.total_length += length
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[Message, float]]:
+        """
+        Search for messages sharing character n-grams with the query.
+
+        Returns:
+            List of (Message, BM25 score) pairs, best first
+        """
+        with self._lock:
+            n_docs = len(self.messages)
+            if n_docs == 0:
+                return []
+
+            avg_length = self.total_length / n_docs or 1.0
+            scores: Dict[int, float] = defaultdict(float)
+            for gram in set(char_ngrams(query)):
+                postings = self.postings.get(gram)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            return [(self.messages[doc_id], score) for doc_id, score in best]
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+
+class _LoadedIndex:
+    def __init__(self):
+        self.index = LexicalIndex()
+        self.segments: Set[str] = set()
+        self.mtime: Optional[int] = None
+
+
+class LexicalIndexStore:
+    def __init__(self, index_dir: str = settings.LEXICAL_INDEX_DIR):
+        """
+        Per-collection LexicalIndex registry persisted to disk.
+
+        Each collection is a directory of append-only segment files, one per
+        load, holding only the indexed messages; postings are rebuilt in memory.
+        Workers pick up segments written by other workers when the directory's
+        mtime changes, and reload from scratch when segments were removed by a
+        rebuild.
+
+        Args:
+            index_dir: Directory where indexes are stored
+        """
+        self.index_dir = index_dir
+        self._indexes: Dict[str, _LoadedIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str) -> LexicalIndex:
+        """Get the index of a collection, loading segments written since the last call."""
+        path = self._path(collection_name)
+        try:
+            # stat before listing so a segment written in between is picked up next time
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        with self._lock:
+            loaded = self._indexes.get(collection_name)
+            if loaded is not None and loaded.mtime == mtime:
+                return loaded.index
+
+            segments = self._segments(collection_name)
+            if loaded is None or not loaded.segments.issubset(segments):
+                loaded = _LoadedIndex()
+            for segment in sorted(set(segments) - loaded.segments):
+                try:
+                    loaded.index.add(self._read_segment(os.path.join(path, segment)))
+                except FileNotFoundError:
+                    # Removed by a concurrent rebuild, whose segment is picked up next time
+                    mtime = None
+                    continue
+                loaded.segments.add(segment)
+            loaded.mtime = mtime
+            self._indexes[collection_name] = loaded
+            return loaded.index
+
+    def search(self, collection_name: str, query: str, top_k: int = 5) -> List[Tuple[Message, float]]:
+        """Search the index of a collection, loading new segments first."""
+        return self.get(collection_name).search(query, top_k)
+
+    def exists(self, collection_name: str) -> bool:
+        """Check whether a collection has a persisted index."""
+        return bool(self._segments(collection_name))
+
+    def add(
+        self,
+        collection_name: str,
+        messages: List[Message],
+        backfill: Optional[Callable[[], Iterable[List[Message]]]] = None
+    ):
+        """
+        Index messages of a collection and persist them as a new segment.
+
+        Args:
+            collection_name: Collection the messages were stored in
+            messages: Newly stored messages
+            backfill: Callable returning the collection's other stored messages; if the
+                collection has no index yet, it is built from them and `messages`
+        """
+        if backfill is not None and not self.exists(collection_name):
+            count = self.rebuild(collection_name, itertools.chain(backfill(), [messages]))
+            logger.info(f"Backfilled lexical index of {collection_name} with {count} messages")
+            return
+        if not messages:
+            return
+
+        self.get(collection_name)
+        with self._lock:
+            # Written and registered under the lock so a concurrent get() cannot
+            # load the segment before it is marked as indexed
+            loaded = self._indexes[collection_name]
+            loaded.segments.add(self._write_segment(collection_name, messages))
+            loaded.index.add(messages)
+
+    def rebuild(self, collection_name: str, batches: Iterable[List[Message]]) -> int:
+        """
+        Replace the index of a collection with the given messages (e.g. read back from the vector store).
+
+        Returns:
+            Number of indexed messages
+        """
+        old_segments = self._segments(collection_name)
+        messages = [msg for batch in batches for msg in batch]
+        if messages:
+            self._write_segment(collection_name, messages)
+        for segment in old_segments:
+            os.remove(os.path.join(self._path(collection_name), segment))
+        return len(messages)
+
+    def delete(self, collection_name: str):
+        """Remove the index of a collection."""
+        with self._lock:
+            self._indexes.pop(collection_name, None)
+            shutil.rmtree(self._path(collection_name), ignore_errors=True)
+
+    def _segments(self, collection_name: str) -> List[str]:
+        try:
+            names = os.listdir(self._path(collection_name))
+        except FileNotFoundError:
+            return []
+        return [name for name in names if name.endswith(SEGMENT_SUFFIX)]
+
+    def _write_segment(self, collection_name: str, messages: List[Message]) -> str:
+        path = self._path(collection_name)
+        os.makedirs(path, exist_ok=True)
+        segment = f"{time.time_ns():020d}-{os.getpid()}-{threading.get_ident()}{SEGMENT_SUFFIX}"
+        tmp_path = os.path.join(path, f".{segment}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for msg in messages:
+                f.write(json.dumps(
+                    [msg.chatroom_id, msg.timestamp.strftime("%Y-%m-%d %H:%M:%S"), msg.content, msg.frequency],
+                    ensure_ascii=False
+                ))
+                f.write("\n")
+        os.replace(tmp_path, os.path.join(path, segment))
+        return segment
+
+    def _read_segment(self, path: str) -> List[Message]:
+        messages = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                chatroom_id, timestamp, content, frequency = json.loads(line)
+                messages.append(Message(
+                    chatroom_id=chatroom_id,
+                    timestamp=datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S"),
+                    content=content,
+                    frequency=frequency
+                ))
+        return messages
+
+    def _path(self, collection_name: str) -> str:
+        return os.path.join(self.index_dir, collection_name)
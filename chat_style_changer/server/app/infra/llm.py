@@ -1,18 +1,23 @@
 import os
+from typing import Optional
 
+from app.config.config import settings
 from openai import OpenAI
 
 
 class LLMService:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-4.1-2025-04-14"
+        self.client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=settings.OPENAI_BASE_URL or None
+        )
+        self.model = settings.LLM_STRONG_MODEL
 
-    def generate_response(self, prompt: str, input: str) -> str:
+    def generate_response(self, prompt: str, input: str, model: Optional[str] = None) -> str:
         """Generate a response using the LLM."""
         response = self.client.responses.create(
-            model=self.model,
+            model=model or self.model,
             instructions=prompt,
             input=input
         )
-        return response.output_text.strip()
\ No newline at end of file
+        return response.output_text.strip()
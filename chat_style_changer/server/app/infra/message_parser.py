@@ -1,10 +1,11 @@
 import csv
 import os
 from datetime import datetime, timedelta
-from io import StringIO
+from io import StringIO, TextIOWrapper
 from typing import List, Optional
 
 from app.models.message import Message
+from app.models.watermark import Watermark
 from fastapi import UploadFile
 
 
@@ -104,22 +105,44 @@ class MessageParser:
             raise ValueError(f"Failed to parse string: {str}")
     
     @staticmethod
-    async def extract_user_messages(self, file_: UploadFile, user_name: str) -> List[Message]:
+    def chatroom_id_from_filename(filename: str) -> int:
+        """Get the chatroom id from an export file name (e.g. KakaoTalk_Chat_<chatroom_id>_...)."""
+        return int(filename.split("_")[2])
+
+    @staticmethod
+    async def extract_user_messages(
+        file_: UploadFile,
+        user_name: str,
+        watermark: Optional[Watermark] = None
+    ) -> List[Message]:
+        """
+        Extract the messages sent by a user from an uploaded chat export.
+
+        Args:
+            file_: Uploaded CSV file (timestamp, sender, content)
+            user_name: Sender whose messages are extracted
+            watermark: If given, rows at or below the watermark are skipped while reading
+        """
         try:
-            chatroom_id = file_.filename.split("_")[2]
-            contents = await file_.read()
-            reader = csv.reader(StringIO(contents.decode('utf-8')))
+            chatroom_id = MessageParser.chatroom_id_from_filename(file_.filename)
+            await file_.seek(0)
+            stream = TextIOWrapper(file_.file, encoding='utf-8', newline='')
             user_messages = []
-            for timestamp, sender, content in reader:
-                if sender == user_name:
-                    user_messages.append(
-                        Message(
+            try:
+                for timestamp, sender, content in csv.reader(stream):
+                    if sender == user_name:
+                        message = Message(
                             chatroom_id=chatroom_id,
                             timestamp=datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S"),
                             sender=sender,
                             content=content
                         )
-                    )
+                        if watermark is not None and watermark.covers(message):
+                            continue
+                        user_messages.append(message)
+            finally:
+                # Keep the upload's file open for FastAPI to clean up
+                stream.detach()
             return user_messages
         
         except Exception as e:
@@ -0,0 +1,29 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class Metrics:
+    """In-process counters for runtime decisions (model routing, etc.)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def increment(self, group: str, name: str, value: int = 1):
+        """Increment the counter `name` in `group`."""
+        with self._lock:
+            self._counters[group][name] += value
+
+    def get(self, group: str) -> Dict[str, int]:
+        """Get a snapshot of all counters in `group`."""
+        with self._lock:
+            return dict(self._counters.get(group, {}))
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Get a snapshot of all counters."""
+        with self._lock:
+            return {group: dict(counters) for group, counters in self._counters.items()}
+
+
+metrics = Metrics()
@@ -0,0 +1,68 @@
+import asyncio
+import unicodedata
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.infra.metrics import Metrics, metrics
+
+T = TypeVar("T")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query string for use in a single-flight key."""
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str, metrics: Metrics = metrics):
+        """
+        Coalesce concurrent identical calls into one in-flight computation.
+
+        Args:
+            name: Name used for the metrics counters
+            metrics: Metrics registry where leader/duplicate counts are recorded
+        """
+        self.name = name
+        self.metrics = metrics
+        self._calls: Dict[Hashable, _Call] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` unless a call with the same key is already in flight, then await its result.
+
+        Errors are propagated to every waiter. Cancelling a waiter does not affect
+        the others; the computation itself is cancelled only when every waiter has
+        gone away.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.metrics.increment("single_flight", f"{self.name}_calls")
+        else:
+            self.metrics.increment("single_flight", f"{self.name}_duplicates")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Forget the call now so a late caller starts a new flight
+                # instead of joining the task being cancelled
+                self._forget(key, call)
+                call.task.cancel()
+
+    def in_flight(self) -> int:
+        """Get the number of distinct calls currently in flight."""
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -1,7 +1,8 @@
 import os
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
+import numpy as np
 from app.config.config import settings
 from app.models.message import Message
 from pymilvus import (Collection, CollectionSchema, DataType, FieldSchema,
@@ -9,19 +10,26 @@ from pymilvus import (Collection, CollectionSchema, DataType, FieldSchema,
 
 from .embedding import EmbeddingService
 
+# Search traffic and long-running admin operations (load, insert, flush, drop)
+# use separate connections so admin RPCs never queue in front of searches.
+SEARCH_ALIAS = "default"
+ADMIN_ALIAS = "admin"
+
 
 class VectorStore:
     def __init__(self):
-        # Milvus connection
-        connections.connect(uri=settings.MILVUS_URL, token=settings.MILVUS_TOKEN)
+        # Milvus connections
+        for alias in (SEARCH_ALIAS, ADMIN_ALIAS):
+            connections.connect(alias=alias, uri=settings.MILVUS_URL, token=settings.MILVUS_TOKEN)
         
         # Initialize embedding service
         self.embedding_service = EmbeddingService()
         self.loaded_collection = None
+        self._loaded_admin_collection = None
 
     def get_collections(self) -> List[Tuple[str, int]]:
         """Get all collections in the database."""
-        collections = utility.list_collections()
+        collections = utility.list_collections(using=ADMIN_ALIAS)
         return [(collection, self.get_count(collection)) for collection in collections]
     
     def get_loaded_collection(self) -> Optional[str]:
@@ -29,14 +37,22 @@ class VectorStore:
         return self.loaded_collection.name if self.loaded_collection else None
     
     def load_collection(self, collection_name: str):
-        """Load a collection into memory."""
-        if self.loaded_collection:
-            self.loaded_collection.release()
+        """
+        Load a collection into memory.
+
+        load() is always sent, even for the collection this process thinks is
+        loaded: Milvus treats it as a no-op when the collection is loaded, and
+        another worker or a Milvus restart may have released it.
+        """
+        if self.loaded_collection and self.loaded_collection.name != collection_name:
+            self._loaded_admin_collection.release()
             self.loaded_collection = None
+            self._loaded_admin_collection = None
 
-        collection = Collection(collection_name)
-        collection.load()
-        self.loaded_collection = collection
+        admin_collection = Collection(collection_name, using=ADMIN_ALIAS)
+        admin_collection.load()
+        self._loaded_admin_collection = admin_collection
+        self.loaded_collection = Collection(collection_name, using=SEARCH_ALIAS)
 
     def create_collection(self, collection_name: str):
         """Create a new collection with the specified schema."""
@@ -46,9 +62,10 @@ class VectorStore:
             FieldSchema(name="chatroom_id", dtype=DataType.INT64),
             FieldSchema(name="timestamp", dtype=DataType.VARCHAR, max_length=65535),
             FieldSchema(name="content", dtype=DataType.VARCHAR, max_length=65535),
+            FieldSchema(name="frequency", dtype=DataType.INT64),
         ]
         schema = CollectionSchema(fields=fields, description="Document collection")
-        collection = Collection(name=collection_name, schema=schema)
+        collection = Collection(name=collection_name, schema=schema, using=ADMIN_ALIAS)
         
         # Create index for embedding field
         index_params = {
@@ -62,36 +79,146 @@ class VectorStore:
     def delete_collection(self, collection_name: str):
         """Delete a collection from the database."""
         try:
-            utility.drop_collection(collection_name)
+            utility.drop_collection(collection_name, using=ADMIN_ALIAS)
         except Exception as e:
             print(f"Error deleting collection {collection_name}: {e}")
             raise e
 
-    def add(self, messages: List[Message], embeddings: List[List[float]]):
-        """Add documents to the vector store."""            
+    def add(
+        self,
+        collection_name: str,
+        messages: List[Message],
+        embeddings: np.ndarray,
+        flush: bool = True
+    ) -> List[int]:
+        """
+        Add documents with their (n, dim) float32 embeddings to a collection.
+
+        Returns:
+            Primary keys of the inserted entities, in input order
+        """
         chatroom_ids = [msg.chatroom_id for msg in messages]
         timestamps = [msg.timestamp.strftime("%Y-%m-%d %H:%M:%S") for msg in messages]  # Convert datetime to string
         contents = [msg.content for msg in messages]
 
         # Prepare data for insertion
         documents = [
-            embeddings,  # embedding field
+            list(embeddings),  # embedding field (row views, no copy)
             chatroom_ids,   # text field
             timestamps,   # datetime field as string
             contents,   # text field
         ]
+        # Collections created before dedup have no frequency field
+        collection = Collection(collection_name, using=ADMIN_ALIAS)
+        if self._has_field(collection, "frequency"):
+            documents.append([msg.frequency for msg in messages])
 
         # Insert data
-        self.loaded_collection.insert(documents)
-        self.loaded_collection.flush()
+        result = collection.insert(documents)
+        if flush:
+            collection.flush()
+        return list(result.primary_keys)
+
+    def add_frequencies(
+        self,
+        collection_name: str,
+        increments: Dict[int, int],
+        batch_size: int = 1000
+    ) -> Dict[int, int]:
+        """
+        Add to the frequency of stored messages of a collection.
+
+        Fields cannot be updated in place on auto-id collections, so the entities
+        are re-inserted with the new frequency. The old entities are left in place
+        for the caller to delete once the new ones are flushed, so a failed load
+        can be undone by deleting the new ones. Collections created before dedup
+        have no frequency field and are left as is.
+
+        Args:
+            increments: {primary key: frequency to add}
+
+        Returns:
+            {old primary key: current primary key} for every entity that still exists
+        """
+        collection = Collection(collection_name, using=ADMIN_ALIAS)
+        has_frequency = self._has_field(collection, "frequency")
+        output_fields = ["id"] + self._output_fields(collection) + (["embedding"] if has_frequency else [])
+
+        ids = list(increments)
+        current: Dict[int, int] = {}
+        for start in range(0, len(ids), batch_size):
+            rows = collection.query(expr=f"id in {ids[start:start + batch_size]}", output_fields=output_fields)
+            if not rows:
+                continue
+            old_ids = [row["id"] for row in rows]
+            if not has_frequency:
+                current.update((id_, id_) for id_ in old_ids)
+                continue
+
+            messages, embeddings = self._rows_to_vectors(rows)
+            for msg, id_ in zip(messages, old_ids):
+                msg.frequency += increments[id_]
+            new_ids = self.add(collection_name, messages, embeddings, flush=False)
+            current.update(zip(old_ids, new_ids))
+        return current
+
+    def iter_contents(self, collection_name: str, batch_size: int = 5000) -> Iterator[List[Tuple[int, str]]]:
+        """Iterate over (primary key, content) pairs of a collection, without embeddings."""
+        collection = Collection(collection_name, using=ADMIN_ALIAS)
+        collection.load()
+        iterator = collection.query_iterator(batch_size=batch_size, expr="", output_fields=["id", "content"])
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                yield [(row["id"], row["content"]) for row in rows]
+        finally:
+            iterator.close()
+
+    def iter_messages(
+        self,
+        collection_name: str,
+        exclude_ids: Optional[Set[int]] = None,
+        batch_size: int = 5000
+    ) -> Iterator[List[Message]]:
+        """Iterate over the stored messages of a collection without embeddings, skipping `exclude_ids`."""
+        collection = Collection(collection_name, using=ADMIN_ALIAS)
+        collection.load()
+        iterator = collection.query_iterator(
+            batch_size=batch_size,
+            expr="",
+            output_fields=["id"] + self._output_fields(collection)
+        )
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                if exclude_ids:
+                    rows = [row for row in rows if row["id"] not in exclude_ids]
+                yield self._rows_to_messages(rows)
+        finally:
+            iterator.close()
+
+    def delete(self, collection_name: str, ids: List[int], batch_size: int = 1000):
+        """Delete entities of a collection by primary key."""
+        collection = Collection(collection_name, using=ADMIN_ALIAS)
+        for start in range(0, len(ids), batch_size):
+            collection.delete(expr=f"id in {ids[start:start + batch_size]}")
+
+    def flush(self, collection_name: str):
+        """Flush pending inserts and deletes of a collection."""
+        Collection(collection_name, using=ADMIN_ALIAS).flush()
 
-    def search(self, query: str, top_k: int = 5) -> List[Tuple[Message, float]]:
+    def search(self, query: str, top_k: int = 5, timeout: Optional[float] = None) -> List[Tuple[Message, float]]:
         """
         Search for similar documents.
         
         Args:
             query: The search query string
             top_k: Number of results to return
+            timeout: RPC timeout in seconds
             
         Returns:
             List of tuples containing (Message, score) pairs
@@ -111,7 +238,8 @@ class VectorStore:
             anns_field="embedding",
             param=search_params,
             limit=top_k,
-            output_fields=["chatroom_id", "timestamp", "content"]
+            output_fields=self._output_fields(self.loaded_collection),
+            timeout=timeout
         )
         
         # Convert results to Message objects with scores
@@ -125,19 +253,124 @@ class VectorStore:
                 message = Message(
                     chatroom_id=hit.entity.get('chatroom_id'),
                     timestamp=timestamp,
-                    content=hit.entity.get('content')
+                    content=hit.entity.get('content'),
+                    frequency=hit.entity.get('frequency') or 1
                 )
                 messages_with_scores.append((message, hit.score))
         
         return messages_with_scores
 
+    def iter_vectors(
+        self,
+        collection_name: str,
+        batch_size: int = 1000,
+        limit: Optional[int] = None
+    ) -> Iterator[Tuple[List[Message], np.ndarray]]:
+        """
+        Iterate over the stored messages and embeddings of a collection.
+
+        Args:
+            collection_name: Collection to read
+            batch_size: Number of entities fetched per round trip
+            limit: Maximum number of entities to return (all if None)
+
+        Yields:
+            Tuples of (messages, (n, dim) float32 embeddings) per batch
+        """
+        collection = Collection(collection_name, using=ADMIN_ALIAS)
+        collection.load()
+        iterator = collection.query_iterator(
+            batch_size=batch_size,
+            limit=limit if limit is not None else -1,
+            expr="",
+            output_fields=self._output_fields(collection) + ["embedding"]
+        )
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                yield self._rows_to_vectors(rows)
+        finally:
+            iterator.close()
+
+    def sample_vectors(
+        self,
+        collection_name: str,
+        sample_size: int,
+        batch_size: int = 1000,
+        seed: Optional[int] = None
+    ) -> Iterator[Tuple[List[Message], np.ndarray]]:
+        """
+        Iterate over a uniform random sample of the stored messages and embeddings.
+
+        Only primary keys are scanned for the whole collection; embeddings are
+        fetched for the sampled entities only.
+
+        Args:
+            collection_name: Collection to read
+            sample_size: Maximum number of entities to return
+            batch_size: Number of entities fetched per round trip
+            seed: Random seed
+
+        Yields:
+            Tuples of (messages, (n, dim) float32 embeddings) per batch
+        """
+        collection = Collection(collection_name, using=ADMIN_ALIAS)
+        collection.load()
+        iterator = collection.query_iterator(batch_size=batch_size * 10, expr="", output_fields=["id"])
+        ids: List[int] = []
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                ids.extend(row["id"] for row in rows)
+        finally:
+            iterator.close()
+
+        if len(ids) > sample_size:
+            rng = np.random.default_rng(seed)
+            ids = sorted(rng.choice(np.asarray(ids, dtype=np.int64), size=sample_size, replace=False).tolist())
+
+        output_fields = self._output_fields(collection) + ["embedding"]
+        for start in range(0, len(ids), batch_size):
+            rows = collection.query(expr=f"id in {ids[start:start + batch_size]}", output_fields=output_fields)
+            if rows:
+                yield self._rows_to_vectors(rows)
+
+    def _rows_to_vectors(self, rows: List[dict]) -> Tuple[List[Message], np.ndarray]:
+        return self._rows_to_messages(rows), np.asarray([row["embedding"] for row in rows], dtype=np.float32)
+
+    def _rows_to_messages(self, rows: List[dict]) -> List[Message]:
+        return [
+            Message(
+                chatroom_id=row["chatroom_id"],
+                timestamp=datetime.strptime(row["timestamp"], "%Y-%m-%d %H:%M:%S"),
+                content=row["content"],
+                frequency=row.get("frequency") or 1
+            )
+            for row in rows
+        ]
+
+    def _has_field(self, collection: Collection, field_name: str) -> bool:
+        return any(field.name == field_name for field in collection.schema.fields)
+
+    def _output_fields(self, collection: Collection) -> List[str]:
+        output_fields = ["chatroom_id", "timestamp", "content"]
+        if self._has_field(collection, "frequency"):
+            output_fields.append("frequency")
+        return output_fields
+
     def get_count(self, collection_name: str) -> int:
         """Get the total number of documents in the collection."""
-        return Collection(collection_name).num_entities
+        return Collection(collection_name, using=ADMIN_ALIAS).num_entities
 
     def drop_collection(self, collection_name: str):
         """Drop a collection from the vector store."""
-        collection = Collection(collection_name)
+        collection = Collection(collection_name, using=ADMIN_ALIAS)
         collection.release()
-        self.loaded_collection = None
+        if self.get_loaded_collection() == collection_name:
+            self.loaded_collection = None
+            self._loaded_admin_collection = None
         collection.drop()
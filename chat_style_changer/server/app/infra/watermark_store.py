@@ -0,0 +1,73 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+from app.config.config import settings
+from app.models.message import Message
+from app.models.watermark import Watermark
+
+from .file_lock import FileLock
+
+
+class WatermarkStore:
+    def __init__(self, watermark_dir: str = settings.WATERMARK_DIR):
+        """
+        Initialize WatermarkStore.
+
+        Watermarks are kept per (collection, chatroom_id) in one JSON file per collection.
+        Updates take a per-collection file lock, so workers never lose each other's commits.
+
+        Args:
+            watermark_dir: Directory where watermark files are stored
+        """
+        self.watermark_dir = watermark_dir
+
+    def get(self, collection_name: str, chatroom_id: int) -> Optional[Watermark]:
+        """Get the watermark of a chatroom in a collection."""
+        return self._read(collection_name).get(str(chatroom_id))
+
+    def commit(self, collection_name: str, messages: List[Message]):
+        """
+        Advance the watermarks of a collection past the ingested messages.
+
+        The file is replaced atomically, so a crash never leaves a partial update.
+        """
+        with self._lock(collection_name):
+            watermarks = self._read(collection_name)
+            for msg in messages:
+                key = str(msg.chatroom_id)
+                watermark = watermarks.get(key)
+                if watermark is None:
+                    watermark = Watermark(timestamp=msg.timestamp)
+                watermarks[key] = watermark.advance(msg)
+
+            path = self._path(collection_name)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {key: watermark.model_dump(mode="json") for key, watermark in watermarks.items()},
+                    f,
+                    ensure_ascii=False
+                )
+            os.replace(tmp_path, path)
+
+    def delete(self, collection_name: str):
+        """Remove all watermarks of a collection."""
+        with self._lock(collection_name):
+            path = self._path(collection_name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _lock(self, collection_name: str) -> FileLock:
+        return FileLock(f"{self._path(collection_name)}.lock")
+
+    def _read(self, collection_name: str) -> Dict[str, Watermark]:
+        path = self._path(collection_name)
+        if not os.path.exists(path):
+            return {}
+
+        with open(path, "r", encoding="utf-8") as f:
+            return {key: Watermark.model_validate(value) for key, value in json.load(f).items()}
+
+    def _path(self, collection_name: str) -> str:
+        return os.path.join(self.watermark_dir, f"{collection_name}.json")
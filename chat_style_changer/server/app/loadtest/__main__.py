@@ -0,0 +1,169 @@
+"""
+Load-testing harness for the HTTP API.
+
+By default it starts a local stack: a stub LLM (app.loadtest.fake_llm) and the
+API server backed by a Milvus Lite file, loads a synthetic corpus and replays
+a mix of /convert, /vector-store:search and /collections/vectors:load traffic.
+Pass --base-url to target an already running server instead.
+
+Examples:
+    python -m app.loadtest --concurrency 16 --duration 60 --output results.json
+    python -m app.loadtest --rate 20 --mix convert=1 --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import httpx
+
+from .driver import LoadTestDriver
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, weight = item.split("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def wait_for_health(base_url: str, timeout: float, process: subprocess.Popen):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(1.0)
+    raise TimeoutError(f"Server at {base_url} did not become healthy in {timeout}s")
+
+
+@contextmanager
+def local_stack(port: int, llm_port: int, llm_latency_ms: float, startup_timeout: float) -> Iterator[str]:
+    """Start the stub LLM and the API server against a Milvus Lite file."""
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    env = {
+        **os.environ,
+        "MILVUS_URL": os.path.join(workdir, "milvus.db"),
+        "MILVUS_TOKEN": "",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+        "OPENAI_API_KEY": "fake",
+        "STYLE_PROFILE_DIR": os.path.join(workdir, "style_profiles"),
+        "SNAPSHOT_DIR": os.path.join(workdir, "snapshots"),
+        "DEDUP_INDEX_DIR": os.path.join(workdir, "dedup_index"),
+        "WATERMARK_DIR": os.path.join(workdir, "watermarks"),
+        "LEXICAL_INDEX_DIR": os.path.join(workdir, "lexical_index"),
+    }
+    processes = []
+    try:
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "app.loadtest.fake_llm",
+             "--port", str(llm_port), "--latency-ms", str(llm_latency_ms)],
+            env=env
+        ))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            env=env
+        )
+        processes.append(server)
+        base_url = f"http://127.0.0.1:{port}"
+        wait_for_health(base_url, startup_timeout, server)
+        yield base_url
+    finally:
+        # Server first, then the stub LLM; the workdir holds the Milvus Lite database
+        for process in reversed(processes):
+            process.terminate()
+            process.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_report(result: Dict, previous: Optional[Dict] = None):
+    columns = ("requests", "error_rate", "throughput", "p50_ms", "p95_ms", "p99_ms")
+    print(f"{'endpoint':<10}" + "".join(f"{column:>14}" for column in columns))
+
+    rows = {**result["endpoints"], "total": result["total"]}
+    for name, summary in rows.items():
+        print(f"{name:<10}" + "".join(f"{str(summary[column]):>14}" for column in columns))
+        if previous is None:
+            continue
+
+        before = previous["endpoints"].get(name) if name != "total" else previous["total"]
+        if before is None:
+            continue
+        deltas = []
+        for column in columns:
+            if summary[column] is None or before[column] is None or not before[column]:
+                deltas.append("-")
+            else:
+                deltas.append(f"{(summary[column] - before[column]) / before[column]:+.1%}")
+        print(f"{'  vs prev':<10}" + "".join(f"{delta:>14}" for delta in deltas))
+
+
+async def main(args: argparse.Namespace):
+    driver = LoadTestDriver(
+        base_url=args.base_url,
+        collection_name=args.collection,
+        mix=parse_mix(args.mix),
+        load_size=args.load_size,
+        timeout=args.timeout
+    )
+    if args.corpus_size:
+        print(f"Loading {args.corpus_size} synthetic messages into {args.collection}...")
+        await driver.setup(args.corpus_size)
+
+    print(f"Running for {args.duration}s...")
+    result = await driver.run(
+        duration=args.duration,
+        rate=args.rate,
+        concurrency=args.concurrency if args.rate is None else None
+    )
+
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(result, previous)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-testing harness for the HTTP API")
+    parser.add_argument("--base-url", help="Target a running server instead of starting a local stack")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test duration in seconds")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate in requests/second")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed-loop workers (ignored with --rate)")
+    parser.add_argument("--mix", default="convert=0.6,search=0.35,load=0.05", help="Endpoint weights")
+    parser.add_argument("--collection", default="loadtest", help="Collection to search and load into")
+    parser.add_argument("--corpus-size", type=int, default=1000, help="Messages loaded before the run (0 to skip)")
+    parser.add_argument("--load-size", type=int, default=50, help="Rows uploaded per load request")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Save results as JSON")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the local API server")
+    parser.add_argument("--llm-port", type=int, default=8766, help="Port of the local stub LLM")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="Latency of the stub LLM")
+    parser.add_argument("--startup-timeout", type=float, default=600.0, help="Seconds to wait for the local stack")
+    args = parser.parse_args()
+
+    if args.base_url:
+        asyncio.run(main(args))
+    else:
+        with local_stack(args.port, args.llm_port, args.llm_latency_ms, args.startup_timeout) as base_url:
+            args.base_url = base_url
+            asyncio.run(main(args))
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS = ("convert", "search", "load")
+
+SAMPLE_QUERIES = [
+    "오늘 회의는 없어요",
+    "내일 몇 시에 만날까요?",
+    "점심 뭐 먹을지 정했어?",
+    "지금 출발했어요",
+    "그거 진짜 재밌었어",
+    "조금 늦을 것 같아요 미안해요",
+    "주말에 시간 괜찮아?",
+    "자료 보내드렸습니다",
+]
+
+SAMPLE_UTTERANCES = [
+    "ㅋㅋㅋㅋ 진짜?", "오늘 너무 피곤하다", "ㅇㅋ 알겠어", "점심 뭐먹지", "헐 대박",
+    "내일 보자~", "지금 가는 중!", "아 그거 나도 봤어 ㅋㅋ", "고마워 😊", "잘자",
+    "회의 몇시였지?", "그럼 그때 봐요", "배고파ㅠㅠ", "아직 안 끝났어", "좋아좋아",
+]
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def build_chat_csv(size: int, sender: str, seed: int = 0) -> bytes:
+    """Build a synthetic KakaoTalk-style export (timestamp, sender, content) with `size` rows."""
+    rng = random.Random(seed)
+    timestamp = datetime(2024, 1, 1, 9, 0, 0)
+    lines = []
+    for _ in range(size):
+        timestamp += timedelta(seconds=rng.randint(5, 600))
+        content = rng.choice(SAMPLE_UTTERANCES).replace('"', '""')
+        lines.append(f'{timestamp.strftime("%Y-%m-%d %H:%M:%S")},{sender},"{content}"')
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    def record(self, latency: float, ok: bool):
+        if ok:
+            self.latencies.append(latency)
+        else:
+            self.errors += 1
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        """Summarize throughput, error rate and latency percentiles (ms)."""
+        latencies = sorted(self.latencies)
+        requests = len(latencies) + self.errors
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / requests, 4) if requests else 0.0,
+            "throughput": round(len(latencies) / duration, 2) if duration else 0.0,
+            "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "p50_ms": ms(percentile(latencies, 50)),
+            "p95_ms": ms(percentile(latencies, 95)),
+            "p99_ms": ms(percentile(latencies, 99)),
+        }
+
+
+class LoadTestDriver:
+    def __init__(
+        self,
+        base_url: str,
+        collection_name: str,
+        mix: Dict[str, float],
+        user_name: str = "loadtest",
+        load_size: int = 50,
+        timeout: float = 120.0,
+        seed: int = 0
+    ):
+        """
+        Initialize LoadTestDriver.
+
+        Args:
+            base_url: Base URL of the API server (e.g. http://127.0.0.1:8000)
+            collection_name: Collection used by search/convert and loaded into by load requests
+            mix: Relative weight of each endpoint ("convert", "search", "load")
+            user_name: Sender name used in the uploaded chat exports
+            load_size: Number of rows uploaded by each load request
+            timeout: Per-request timeout in seconds
+            seed: Random seed for the request mix
+        """
+        unknown = set(mix) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"Unknown endpoints in mix: {unknown}")
+
+        self.base_url = base_url.rstrip("/")
+        self.collection_name = collection_name
+        self.endpoints = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.endpoints]
+        self.user_name = user_name
+        self.load_size = load_size
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.stats = {name: EndpointStats() for name in self.endpoints}
+
+    async def setup(self, size: int):
+        """Create the collection and load a synthetic corpus of `size` messages."""
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=None) as client:
+            response = await client.get("/api/v1/vector-store/collections")
+            response.raise_for_status()
+            names = [name for name, _ in response.json()["collections"]]
+            if self.collection_name not in names:
+                response = await client.post(
+                    "/api/v1/vector-store/collections", params={"name": self.collection_name}
+                )
+                response.raise_for_status()
+
+            await self._upload(client, build_chat_csv(size, self.user_name))
+            response = await client.post(
+                "/api/v1/vector-store/collections:load", params={"name": self.collection_name}
+            )
+            response.raise_for_status()
+
+    async def run(
+        self,
+        duration: float,
+        rate: Optional[float] = None,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Replay the request mix for `duration` seconds.
+
+        With `rate`, requests arrive open-loop as a Poisson process at `rate` req/s.
+        Otherwise `concurrency` closed-loop workers send requests back to back.
+
+        Returns:
+            Result dict with per-endpoint and total statistics
+        """
+        if rate is None and concurrency is None:
+            raise ValueError("Either rate or concurrency must be set")
+
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            started = time.perf_counter()
+            deadline = started + duration
+            if rate is not None:
+                await self._run_open_loop(client, deadline, rate)
+            else:
+                await asyncio.gather(*(
+                    self._run_worker(client, deadline) for _ in range(concurrency)
+                ))
+            elapsed = time.perf_counter() - started
+
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies.extend(stats.latencies)
+            total.errors += stats.errors
+
+        return {
+            "started_at": datetime.now().isoformat(),
+            "config": {
+                "base_url": self.base_url,
+                "duration": duration,
+                "rate": rate,
+                "concurrency": concurrency,
+                "mix": dict(zip(self.endpoints, self.weights)),
+            },
+            "elapsed": round(elapsed, 2),
+            "endpoints": {name: stats.summary(elapsed) for name, stats in self.stats.items()},
+            "total": total.summary(elapsed),
+        }
+
+    async def _run_worker(self, client: httpx.AsyncClient, deadline: float):
+        while time.perf_counter() < deadline:
+            await self._request(client, self._pick_endpoint())
+
+    async def _run_open_loop(self, client: httpx.AsyncClient, deadline: float, rate: float):
+        tasks = set()
+        next_arrival = time.perf_counter()
+        while next_arrival < deadline:
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+            task = asyncio.create_task(self._request(client, self._pick_endpoint()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            next_arrival += self.rng.expovariate(rate)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def _pick_endpoint(self) -> str:
+        return self.rng.choices(self.endpoints, weights=self.weights)[0]
+
+    async def _request(self, client: httpx.AsyncClient, endpoint: str):
+        started = time.perf_counter()
+        try:
+            if endpoint == "convert":
+                response = await client.post(
+                    "/api/v1/convert", json={"query": self.rng.choice(SAMPLE_QUERIES)}
+                )
+                response.raise_for_status()
+            elif endpoint == "search":
+                response = await client.get(
+                    "/api/v1/vector-store:search",
+                    params={"query": self.rng.choice(SAMPLE_QUERIES), "top_k": 5}
+                )
+                response.raise_for_status()
+            else:
+                await self._upload(
+                    client, build_chat_csv(self.load_size, self.user_name, seed=self.rng.randint(0, 1 << 30))
+                )
+            ok = True
+        except Exception as e:
+            logger.debug(f"{endpoint} request failed: {str(e)}")
+            ok = False
+
+        self.stats[endpoint].record(time.perf_counter() - started, ok)
+
+    async def _upload(self, client: httpx.AsyncClient, payload: bytes):
+        """Upload a chat export and consume the progress stream until it finishes."""
+        async with client.stream(
+            "POST",
+            "/api/v1/vector-store/collections/vectors:load",
+            data={"collection_name": self.collection_name, "user_name": self.user_name},
+            files={"csv_file": ("KakaoTalk_Chat_1_loadtest.csv", payload, "text/csv")}
+        ) as response:
+            response.raise_for_status()
+            last_event = None
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    last_event = json.loads(line[len("data: "):])
+
+        if last_event is None or last_event.get("status") != "completed":
+            raise RuntimeError(f"Load did not complete: {last_event}")
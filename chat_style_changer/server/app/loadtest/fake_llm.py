@@ -0,0 +1,68 @@
+"""
+Local stub of the OpenAI Responses API.
+
+Answers every request with three mood variants of the target sentence after a
+configurable delay, so the API can be exercised without calling OpenAI. Point
+the server at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+Run with:
+    python -m app.loadtest.fake_llm --port 8100 --latency-ms 300
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+app = FastAPI(title="Fake LLM")
+app.state.latency = 0.0
+
+
+def _target_sentence(input_: str) -> str:
+    lines = input_.splitlines()
+    for i, line in enumerate(lines):
+        if line.strip() == "주어진 문장:" and i + 1 < len(lines):
+            return lines[i + 1].strip()
+    return input_.strip()
+
+
+@app.post("/v1/responses")
+async def create_response(request: Request):
+    body = await request.json()
+    await asyncio.sleep(app.state.latency)
+
+    target = _target_sentence(body.get("input", ""))
+    output_text = json.dumps(
+        {"즐거운": f"{target}~", "가벼운": f"{target}ㅋㅋ", "딱딱한": target},
+        ensure_ascii=False
+    )
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": body.get("model"),
+        "status": "completed",
+        "output": [{
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": output_text, "annotations": []}]
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": []
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub of the OpenAI Responses API")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    app.state.latency = args.latency_ms / 1000
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -3,6 +3,7 @@ import os
 import uvicorn
 from app.api import api, vector_store
 from app.config.config import settings
+from app.infra.metrics import metrics
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -33,6 +34,10 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def get_metrics():
+    return {"status": "success", "metrics": metrics.snapshot()}
+
 if __name__ == "__main__":
     load_dotenv()
     port = int(os.environ.get("PORT", 8000))
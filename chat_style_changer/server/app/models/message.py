@@ -8,5 +8,7 @@ class Message(BaseModel):
     chatroom_id: int
     timestamp: datetime
     sender: Optional[str] = None
-    content: str    
+    content: str
+    # 중복 제거 시 이 메시지가 대표하는 메시지 수
+    frequency: int = 1
     
\ No newline at end of file
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+
+class StyleProfile(BaseModel):
+    collection_name: str
+    message_count: int
+    # 프로필 생성 시점의 컬렉션 크기 (재생성 여부 판단용)
+    collection_size: int = 0
+    exemplars: List[str]
+    endings: List[str]
+    top_emojis: List[str]
+    laughter_ratio: float
+    created_at: datetime
@@ -0,0 +1,33 @@
+import hashlib
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from .message import Message
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
+
+class Watermark(BaseModel):
+    # 마지막으로 적재한 메시지의 timestamp와, 같은 timestamp를 가진 메시지들의 content hash
+    timestamp: datetime
+    content_hashes: List[str] = []
+
+    def covers(self, message: Message) -> bool:
+        """Check whether the message is at or below the watermark."""
+        if message.timestamp != self.timestamp:
+            return message.timestamp < self.timestamp
+        return content_hash(message.content) in self.content_hashes
+
+    def advance(self, message: Message) -> "Watermark":
+        """Get the watermark after also ingesting the message."""
+        if message.timestamp > self.timestamp:
+            return Watermark(timestamp=message.timestamp, content_hashes=[content_hash(message.content)])
+        if message.timestamp == self.timestamp:
+            hash_ = content_hash(message.content)
+            if hash_ not in self.content_hashes:
+                return Watermark(timestamp=self.timestamp, content_hashes=self.content_hashes + [hash_])
+        return self
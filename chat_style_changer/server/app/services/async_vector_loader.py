@@ -1,47 +1,97 @@
 import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, AsyncGenerator, Dict, List
+from functools import partial
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set, Tuple
 
-from app.infra.vector_store import VectorStore
+import numpy as np
+from app.config.config import settings
+from app.infra.async_vector_store import AsyncVectorStore
+from app.infra.lexical_index import LexicalIndexStore
+from app.infra.watermark_store import WatermarkStore
 from app.models.message import Message
-from sklearn.preprocessing import normalize
+from app.services.batch_planner import BatchPlanner
+from app.services.dedup_index_store import DedupIndexStore
+from app.services.deduplicator import DedupIndex, Deduplicator
+from app.services.style_profiler import StyleProfiler
 
 
 logger = logging.getLogger(__name__)
 
+# Stored representatives whose frequency is updated per round trip
+FREQUENCY_UPDATE_BATCH = 1000
+
+
 class AsyncVectorLoader:
     def __init__(
         self,
-        vector_store: VectorStore,
+        vector_store: AsyncVectorStore,
+        style_profiler: Optional[StyleProfiler] = None,
         batch_size: int = 100,
+        max_batch_tokens: int = settings.EMBEDDING_MAX_BATCH_TOKENS,
+        deduplicator: Optional[Deduplicator] = None,
+        dedup_store: Optional[DedupIndexStore] = None,
+        watermark_store: Optional[WatermarkStore] = None,
+        lexical_store: Optional[LexicalIndexStore] = None,
         max_workers: int = 4
     ):
         """
         Initialize AsyncVectorLoader.
         
         Args:
-            vector_store: VectorStore instance for storing embeddings
-            batch_size: Number of messages to process in each batch
+            vector_store: AsyncVectorStore for storing embeddings; inserts and flushes run on its admin pool
+            style_profiler: StyleProfiler used to refresh the collection's style profile in the background after loading
+            batch_size: Maximum number of messages to process in each batch
+            max_batch_tokens: Maximum padded tokens per batch
+            deduplicator: Deduplicator that collapses duplicate messages before embedding (disabled if None)
+            dedup_store: DedupIndexStore with per-collection dedup tables, so duplicates of messages
+                stored by earlier uploads add to their frequency instead of being inserted again.
+                Its per-collection lock also serializes loads into a collection
+            watermark_store: WatermarkStore advanced after all messages are stored
+            lexical_store: LexicalIndexStore updated after all messages are stored, and backfilled
+                from the collection if it has no index yet
             max_workers: Maximum number of worker threads for parallel processing
         """
         self.vector_store = vector_store
+        self.style_profiler = style_profiler
         self.batch_size = batch_size
+        self.batch_planner = BatchPlanner(max_batch_tokens, batch_size)
+        self.deduplicator = deduplicator
+        self.dedup_store = dedup_store
+        self.watermark_store = watermark_store
+        self.lexical_store = lexical_store
         self.max_workers = max_workers
         self.processed_count = 0
         self.total_count = 0
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    def _run_in_background(self, fn: Callable, *args) -> None:
+        """Run a blocking call in a thread without waiting for it, logging failures."""
+        async def run():
+            try:
+                await asyncio.to_thread(fn, *args)
+            except Exception as e:
+                logger.warning(f"Background task {fn.__qualname__} failed: {str(e)}")
+
+        task = asyncio.create_task(run())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
 
-    def add_batch(self, messages: List[Message], embeddings: List[List[float]]) -> None:
+    async def add_batch(self, collection_name: str, messages: List[Message], embeddings: np.ndarray) -> List[int]:
         """
         Add a batch of messages and their embeddings to the vector store.
         
         Args:
+            collection_name: Collection to insert into
             messages: List of messages to add
-            embeddings: List of embeddings corresponding to the messages
+            embeddings: (n, dim) float32 array of embeddings corresponding to the messages
+
+        Returns:
+            Primary keys of the inserted messages
         """
         try:
-            # Insert into vector store
-            self.vector_store.add(messages=messages, embeddings=embeddings)
+            # Insert into vector store; the loader flushes once after every batch succeeded
+            return await self.vector_store.add(collection_name, messages, embeddings, flush=False)
             
         except Exception as e:
             logger.error(f"Error adding batch to vector store: {str(e)}")
@@ -49,18 +99,22 @@ class AsyncVectorLoader:
 
     async def process_batch(
         self,
+        collection_name: str,
         batch: List[Message],
-        batch_num: int
-    ) -> int:
+        batch_num: int,
+        abort: Optional[asyncio.Event] = None
+    ) -> Tuple[List[Message], List[int]]:
         """
         Process a single batch of messages asynchronously.
         
         Args:
+            collection_name: Collection to insert into
             batch: List of messages to process
             batch_num: Batch number for logging
+            abort: Event set when the load has failed; the batch is then not inserted
             
         Returns:
-            int: Number of processed messages
+            Tuple of (processed messages, their primary keys)
         """
         try:
             # Generate embeddings in a separate thread
@@ -72,16 +126,13 @@ class AsyncVectorLoader:
                     [msg.content for msg in batch]
                 )
             
-            embeddings = normalize(embeddings, norm='l2').tolist()
-            
-            # Store in vector store in a separate thread
-            await asyncio.to_thread(
-                self.add_batch,
-                batch,
-                embeddings
-            )
+            if abort is not None and abort.is_set():
+                return batch, []
+
+            # Store in vector store on the admin pool
+            ids = await self.add_batch(collection_name, batch, embeddings)
             
-            return len(batch)
+            return batch, ids
             
         except Exception as e:
             logger.error(f"Error processing batch {batch_num}: {str(e)}")
@@ -90,40 +141,124 @@ class AsyncVectorLoader:
     async def load_messages(
         self,
         collection_name: str,
-        messages: List[Message]
+        messages: List[Message],
+        incremental: bool = False
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Load messages into vector store with progress tracking.
+
+        Loads into the same collection are serialized across workers by the
+        dedup store's per-collection lock, held until the watermarks are committed.
         
         Args:
             messages: List of messages to process
+            incremental: Skip messages covered by the collection's watermarks, checked under the lock
             
         Yields:
             Dict containing progress information
         """
-        self.total_count = len(messages)
         self.processed_count = 0
+        padding_efficiency = 1.0
+        dedup_ratio = 0.0
         
+        load_lock = None
         try:
-            self.vector_store.load_collection(collection_name)
-            
-            # Split messages into batches
-            batches = [
-                messages[i:i + self.batch_size]
-                for i in range(0, self.total_count, self.batch_size)
-            ]
-            
-            # Create tasks for parallel processing
-            tasks = [
-                self.process_batch(batch, i)
-                for i, batch in enumerate(batches)
-            ]
+            if self.dedup_store is not None:
+                load_lock = self.dedup_store.lock(collection_name)
+                while not load_lock.try_acquire():
+                    await asyncio.sleep(0.1)
+
+            # Messages may have been filtered against older watermarks before the lock
+            # was taken; watermarks only advance, so filtering again is enough
+            if incremental and self.watermark_store is not None:
+                messages = await asyncio.to_thread(self._skip_loaded, collection_name, messages)
+
+            received_count = len(messages)
+            self.total_count = received_count
+            await self.vector_store.load_collection(collection_name)
+            received_messages = messages
+
+            # Nothing new to store (e.g. an incremental re-upload)
+            if not messages:
+                yield {
+                    "status": "completed",
+                    "processed": 0,
+                    "total": 0,
+                    "percentage": 100.0,
+                    "received": received_count,
+                    "dedup_ratio": dedup_ratio,
+                    "padding_efficiency": padding_efficiency
+                }
+                return
+
+            # Collapse exact and near-duplicate messages before embedding
+            dedup_index = None
+            existing: Dict[int, Message] = {}
+            if self.deduplicator is not None:
+                messages, _ = await asyncio.to_thread(self.deduplicator.deduplicate, messages)
+
+                # Fold messages already stored by earlier uploads into their representatives
+                if self.dedup_store is not None:
+                    dedup_index = await self.vector_store.run_admin(self._load_dedup_index, collection_name)
+                    messages, existing = self.deduplicator.match(messages, dedup_index)
+
+                dedup_ratio = round(1 - len(messages) / received_count, 4)
+                logger.info(
+                    f"Deduplicated {received_count} messages into {len(messages)} new "
+                    f"and {len(existing)} existing representatives (ratio {dedup_ratio})"
+                )
             
-            # Process batches and track progress
-            for task in asyncio.as_completed(tasks):
-                try:
-                    batch_count = await task
-                    self.processed_count += batch_count
+            abort = asyncio.Event()
+            tasks: List[asyncio.Future] = []
+            extra_ids: List[int] = []
+            replaced_ids: List[int] = []
+            try:
+                # Add the frequencies of matched messages to their stored representatives
+                # by storing updated copies; the old entities are deleted after the flush.
+                # Representatives missing from the collection are stored again below
+                missing: List[Message] = []
+                if dedup_index is not None and existing:
+                    pks = list(existing)
+                    current: Dict[int, int] = {}
+                    for start in range(0, len(pks), FREQUENCY_UPDATE_BATCH):
+                        updated = await self.vector_store.add_frequencies(
+                            collection_name,
+                            {pk: existing[pk].frequency for pk in pks[start:start + FREQUENCY_UPDATE_BATCH]}
+                        )
+                        for old, new in updated.items():
+                            if old != new:
+                                extra_ids.append(new)
+                                replaced_ids.append(old)
+                        current.update(updated)
+                    dedup_index.remap({old: new for old, new in current.items() if old != new})
+                    missing = [msg for id_, msg in existing.items() if id_ not in current]
+
+                to_store = messages + missing
+                self.total_count = len(to_store)
+
+                # Split messages into length-bucketed batches under the token budget
+                lengths = await asyncio.to_thread(
+                    self.vector_store.embedding_service.count_tokens,
+                    [msg.content for msg in to_store]
+                )
+                plan = self.batch_planner.plan(lengths)
+                padding_efficiency = round(plan.padding_efficiency, 4)
+                logger.info(
+                    f"Planned {len(plan.batches)} batches for {self.total_count} messages "
+                    f"(padding efficiency {padding_efficiency})"
+                )
+                batches = [[to_store[i] for i in batch] for batch in plan.batches]
+
+                # Create tasks for parallel processing
+                tasks.extend(
+                    asyncio.ensure_future(self.process_batch(collection_name, batch, i, abort))
+                    for i, batch in enumerate(batches)
+                )
+
+                # Process batches and track progress
+                for task in asyncio.as_completed(tasks):
+                    batch, _ = await task
+                    self.processed_count += len(batch)
                     
                     # Calculate and yield progress
                     percentage = (self.processed_count / self.total_count) * 100
@@ -131,23 +266,75 @@ class AsyncVectorLoader:
                         "status": "processing",
                         "processed": self.processed_count,
                         "total": self.total_count,
-                        "percentage": round(percentage, 2)
+                        "percentage": round(percentage, 2),
+                        "received": received_count,
+                        "dedup_ratio": dedup_ratio,
+                        "padding_efficiency": padding_efficiency
                     }
-                    
+
+                inserted = [pair for task in tasks for pair in zip(*task.result())]
+                missing_keys = {id(msg) for msg in missing}
+                new_ids = {id_ for msg, id_ in inserted if id(msg) not in missing_keys}
+
+                # Make the load durable in one step, only after every insert succeeded
+                await self.vector_store.flush(collection_name)
+
+            except Exception as e:
+                logger.error(f"Error in batch processing: {str(e)}")
+                await self._discard(collection_name, tasks, abort, extra_ids)
+                yield {
+                    "status": "error",
+                    "error": str(e)
+                }
+                return
+
+            except (GeneratorExit, asyncio.CancelledError):
+                await self._discard(collection_name, tasks, abort, extra_ids)
+                raise
+
+            # The updated copies are flushed, so the outdated representatives can go.
+            # This is past the point of undo: a failure leaves stale copies, not lost ones
+            if replaced_ids:
+                try:
+                    await self.vector_store.delete(collection_name, replaced_ids)
                 except Exception as e:
-                    logger.error(f"Error in batch processing: {str(e)}")
-                    yield {
-                        "status": "error",
-                        "error": str(e)
-                    }
-                    return
-            
+                    logger.error(f"Failed to remove {len(replaced_ids)} outdated representatives: {str(e)}")
+
+            if dedup_index is not None:
+                for msg, id_ in inserted:
+                    dedup_index.add(*self.deduplicator.keys(msg.content), id_)
+                await asyncio.to_thread(self.dedup_store.save, collection_name, dedup_index)
+
+            # Advance the per-chatroom watermarks now that every batch is stored
+            if self.watermark_store is not None:
+                await asyncio.to_thread(self.watermark_store.commit, collection_name, received_messages)
+
+            # Index the stored messages for lexical retrieval; the vectors are already
+            # committed, so a failure here only leaves the index to be rebuilt
+            if self.lexical_store is not None:
+                try:
+                    await self.vector_store.run_admin(
+                        self.lexical_store.add,
+                        collection_name,
+                        messages,
+                        partial(self.vector_store.vector_store.iter_messages, collection_name, new_ids)
+                    )
+                except Exception as e:
+                    logger.warning(f"Lexical indexing of {collection_name} failed: {str(e) or type(e).__name__}")
+
+            # Rebuild the style profile in the background once the collection has grown enough
+            if self.style_profiler is not None:
+                self._run_in_background(self.style_profiler.refresh, collection_name)
+
             # Yield completion status
             yield {
                 "status": "completed",
                 "processed": self.total_count,
                 "total": self.total_count,
-                "percentage": 100.0
+                "percentage": 100.0,
+                "received": received_count,
+                "dedup_ratio": dedup_ratio,
+                "padding_efficiency": padding_efficiency
             }
             
         except Exception as e:
@@ -157,6 +344,56 @@ class AsyncVectorLoader:
                 "error": str(e)
             }
 
+        finally:
+            if load_lock is not None:
+                load_lock.release()
+
+    async def _discard(
+        self,
+        collection_name: str,
+        tasks: List[asyncio.Future],
+        abort: asyncio.Event,
+        extra_ids: List[int]
+    ):
+        """Stop pending batches and delete everything a failed load inserted, so a retry starts clean."""
+        abort.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        ids = [id_ for result in results if isinstance(result, tuple) for id_ in result[1]] + extra_ids
+        if not ids:
+            return
+
+        try:
+            await self.vector_store.delete(collection_name, ids)
+            logger.info(f"Removed {len(ids)} messages of the failed load")
+        except Exception as e:
+            logger.error(f"Failed to remove {len(ids)} messages of the failed load: {str(e)}")
+
+    def _skip_loaded(self, collection_name: str, messages: List[Message]) -> List[Message]:
+        """Drop messages covered by the watermark of their chatroom."""
+        watermarks = {
+            chatroom_id: self.watermark_store.get(collection_name, chatroom_id)
+            for chatroom_id in {msg.chatroom_id for msg in messages}
+        }
+        return [
+            msg for msg in messages
+            if watermarks[msg.chatroom_id] is None or not watermarks[msg.chatroom_id].covers(msg)
+        ]
+
+    def _load_dedup_index(self, collection_name: str) -> DedupIndex:
+        """Load a collection's dedup table, backfilling it from stored messages if it has none yet."""
+        vector_store = self.vector_store.vector_store
+        if self.dedup_store.exists(collection_name) or vector_store.get_count(collection_name) == 0:
+            return self.dedup_store.load(collection_name)
+
+        index = self.deduplicator.new_index()
+        for rows in vector_store.iter_contents(collection_name):
+            for id_, content in rows:
+                key, fingerprint = self.deduplicator.keys(content)
+                representative = index.find(key, fingerprint)
+                index.add(key, fingerprint, id_ if representative is None else representative)
+        logger.info(f"Backfilled dedup table of {collection_name} with {len(index)} representatives")
+        return index
+
     def get_progress(self) -> Dict[str, Any]:
         """
         Get current loading progress.
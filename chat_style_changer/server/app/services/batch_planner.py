@@ -0,0 +1,64 @@
+from typing import List
+
+
+class BatchPlan:
+    def __init__(self, batches: List[List[int]], lengths: List[int]):
+        """
+        Result of planning embedding batches.
+
+        Args:
+            batches: Message indices per batch, each batch in original order
+            lengths: Token length of every message
+        """
+        self.batches = batches
+        self.lengths = lengths
+
+    @property
+    def padding_efficiency(self) -> float:
+        """Ratio of real tokens to padded tokens computed by the encoder."""
+        real = sum(self.lengths)
+        padded = sum(len(batch) * max(self.lengths[i] for i in batch) for batch in self.batches)
+        return real / padded if padded else 1.0
+
+
+class BatchPlanner:
+    def __init__(self, max_tokens: int, max_batch_size: int):
+        """
+        Initialize BatchPlanner.
+
+        Args:
+            max_tokens: Maximum padded tokens (batch size * longest sequence) per batch
+            max_batch_size: Maximum number of messages per batch
+        """
+        self.max_tokens = max_tokens
+        self.max_batch_size = max_batch_size
+
+    def plan(self, lengths: List[int]) -> BatchPlan:
+        """
+        Group messages of similar token length into batches under the token budget.
+
+        Messages are visited in ascending length order so each batch pads to a
+        similar length. Indices inside a batch are restored to their original
+        order; batches themselves are ordered by length, not by position.
+
+        Args:
+            lengths: Token length of every message
+
+        Returns:
+            BatchPlan with the batches and padding statistics
+        """
+        batches: List[List[int]] = []
+        batch: List[int] = []
+
+        for index in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+            # Sorted ascending, so the current message is the longest in the batch
+            padded = (len(batch) + 1) * lengths[index]
+            if batch and (padded > self.max_tokens or len(batch) >= self.max_batch_size):
+                batches.append(sorted(batch))
+                batch = []
+            batch.append(index)
+
+        if batch:
+            batches.append(sorted(batch))
+
+        return BatchPlan(batches, lengths)
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from app.config.config import settings
+from app.infra.lexical_index import LexicalIndexStore
+from app.infra.vector_store import VectorStore
+from app.models.message import Message
+from app.services.style_profiler import StyleProfiler
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.json"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CollectionSnapshot:
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        lexical_store: Optional[LexicalIndexStore] = None,
+        style_profiler: Optional[StyleProfiler] = None,
+        snapshot_dir: str = settings.SNAPSHOT_DIR
+    ):
+        """
+        Initialize CollectionSnapshot.
+
+        A snapshot is a directory containing:
+            - embeddings.npy: (n, dim) float32 embeddings, memory-mappable
+            - metadata.json: columnar chatroom_id / timestamp / content / frequency
+            - manifest.json: model name, dim, schema version, count and checksums
+
+        Args:
+            vector_store: VectorStore to export from and import into
+            lexical_store: LexicalIndexStore updated with imported messages
+            style_profiler: StyleProfiler rebuilt for the collection after an import
+            snapshot_dir: Directory where snapshots are stored
+        """
+        self.vector_store = vector_store
+        self.lexical_store = lexical_store
+        self.style_profiler = style_profiler
+        self.snapshot_dir = snapshot_dir
+
+    def export(self, collection_name: str, snapshot_name: str) -> Dict[str, Any]:
+        """
+        Export a collection to a snapshot without re-embedding.
+
+        Returns:
+            The snapshot manifest
+        """
+        path = self._path(snapshot_name)
+        os.makedirs(path, exist_ok=True)
+        embeddings_path = os.path.join(path, EMBEDDINGS_FILE)
+        raw_path = f"{embeddings_path}.tmp"
+        metadata = {"chatroom_id": [], "timestamp": [], "content": [], "frequency": []}
+
+        # Stream raw float32 rows first; the row count is only known at the end
+        count = 0
+        try:
+            with open(raw_path, "wb") as raw:
+                for messages, batch_embeddings in self.vector_store.iter_vectors(collection_name):
+                    if batch_embeddings.shape != (len(messages), settings.MODEL_DIM):
+                        raise ValueError(
+                            f"Unexpected embedding batch shape {batch_embeddings.shape} "
+                            f"for {len(messages)} messages"
+                        )
+                    raw.write(np.ascontiguousarray(batch_embeddings, dtype=np.float32).tobytes())
+                    for msg in messages:
+                        metadata["chatroom_id"].append(msg.chatroom_id)
+                        metadata["timestamp"].append(msg.timestamp.strftime("%Y-%m-%d %H:%M:%S"))
+                        metadata["content"].append(msg.content)
+                        metadata["frequency"].append(msg.frequency)
+                    count += len(messages)
+
+            self._write_npy(raw_path, embeddings_path, count)
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+        with open(os.path.join(path, METADATA_FILE), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+
+        manifest = {
+            "schema_version": SCHEMA_VERSION,
+            "collection_name": collection_name,
+            "model_name": settings.MODEL_NAME,
+            "dim": settings.MODEL_DIM,
+            "count": count,
+            "created_at": datetime.now().isoformat(),
+            "checksums": {
+                EMBEDDINGS_FILE: _sha256(os.path.join(path, EMBEDDINGS_FILE)),
+                METADATA_FILE: _sha256(os.path.join(path, METADATA_FILE)),
+            }
+        }
+        with open(os.path.join(path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        logger.info(f"Exported {count} entities of {collection_name} to {path}")
+        return manifest
+
+    def import_(self, snapshot_name: str, collection_name: str, append: bool = False) -> Dict[str, Any]:
+        """
+        Import a snapshot into a collection without touching the embedding model.
+
+        The collection is created if it does not exist, and its style profile is
+        rebuilt after the import. A failed import is rolled back: a collection it
+        created is dropped, otherwise the rows it inserted are deleted.
+
+        Args:
+            snapshot_name: Snapshot to read
+            collection_name: Collection to import into
+            append: Allow importing into a collection that already has entities
+
+        Returns:
+            The snapshot manifest
+
+        Raises:
+            ValueError: If the snapshot is incompatible or corrupted, or the
+                collection is not empty and `append` is False
+        """
+        path = self._path(snapshot_name)
+        manifest = self.read_manifest(snapshot_name)
+
+        if manifest["schema_version"] != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported snapshot schema version: {manifest['schema_version']}")
+        if manifest["model_name"] != settings.MODEL_NAME or manifest["dim"] != settings.MODEL_DIM:
+            raise ValueError(
+                f"Snapshot was built with {manifest['model_name']} ({manifest['dim']}d), "
+                f"but the server uses {settings.MODEL_NAME} ({settings.MODEL_DIM}d)"
+            )
+        for file_name, checksum in manifest["checksums"].items():
+            if _sha256(os.path.join(path, file_name)) != checksum:
+                raise ValueError(f"Checksum mismatch for {file_name}")
+
+        with open(os.path.join(path, METADATA_FILE), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+        count = manifest["count"]
+        if embeddings.shape != (count, settings.MODEL_DIM) or len(metadata["content"]) != count:
+            raise ValueError(f"Snapshot files do not match the manifest count {count}")
+
+        collections = dict(self.vector_store.get_collections())
+        created = collection_name not in collections
+        if created:
+            self.vector_store.create_collection(collection_name)
+        elif collections[collection_name] > 0 and not append:
+            raise ValueError(
+                f"Collection {collection_name} already has {collections[collection_name]} entities; "
+                f"pass append=true to import into it anyway"
+            )
+
+        frequencies = metadata.get("frequency") or [1] * count
+        chunk_size = settings.SNAPSHOT_IMPORT_CHUNK
+        imported: List[Message] = []
+        imported_ids: List[int] = []
+        try:
+            self.vector_store.load_collection(collection_name)
+            for start in range(0, count, chunk_size):
+                end = min(start + chunk_size, count)
+                messages = [
+                    Message(
+                        chatroom_id=metadata["chatroom_id"][i],
+                        timestamp=datetime.strptime(metadata["timestamp"][i], "%Y-%m-%d %H:%M:%S"),
+                        content=metadata["content"][i],
+                        frequency=frequencies[i]
+                    )
+                    for i in range(start, end)
+                ]
+                imported_ids.extend(self.vector_store.add(
+                    collection_name, messages, np.ascontiguousarray(embeddings[start:end]), flush=False
+                ))
+                if self.lexical_store is not None:
+                    imported.extend(messages)
+            self.vector_store.flush(collection_name)
+
+        except Exception:
+            self._discard(collection_name, created, imported_ids)
+            raise
+
+        if self.lexical_store is not None:
+            # One segment for the whole import; entities already in the collection are
+            # backfilled if it has no lexical index yet
+            self.lexical_store.add(
+                collection_name,
+                imported,
+                partial(self.vector_store.iter_messages, collection_name, set(imported_ids))
+            )
+        if self.style_profiler is not None and count:
+            self.style_profiler.build(collection_name)
+        logger.info(f"Imported {count} entities from {path} into {collection_name}")
+        return manifest
+
+    def _discard(self, collection_name: str, created: bool, ids: List[int]):
+        """Undo a failed import, so it can be retried without duplicating rows."""
+        try:
+            if created:
+                # Dropped rather than emptied: entity counts include deletes until compaction
+                self.vector_store.drop_collection(collection_name)
+            elif ids:
+                self.vector_store.delete(collection_name, ids)
+            logger.info(f"Rolled back the failed import into {collection_name}")
+        except Exception as e:
+            logger.error(f"Failed to roll back the import into {collection_name}: {str(e)}")
+
+    def _write_npy(self, raw_path: str, npy_path: str, count: int):
+        """Copy `count` raw float32 rows into a memory-mappable .npy file."""
+        embeddings = np.lib.format.open_memmap(
+            npy_path,
+            mode="w+",
+            dtype=np.float32,
+            shape=(count, settings.MODEL_DIM)
+        )
+        if count:
+            raw = np.memmap(raw_path, dtype=np.float32, mode="r", shape=(count, settings.MODEL_DIM))
+            chunk_size = settings.SNAPSHOT_IMPORT_CHUNK
+            for start in range(0, count, chunk_size):
+                embeddings[start:start + chunk_size] = raw[start:start + chunk_size]
+            del raw
+        embeddings.flush()
+        del embeddings
+
+    def read_manifest(self, snapshot_name: str) -> Dict[str, Any]:
+        """Read the manifest of a snapshot."""
+        manifest_path = os.path.join(self._path(snapshot_name), MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"Snapshot not found: {snapshot_name}")
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _path(self, snapshot_name: str) -> str:
+        if not snapshot_name or os.path.basename(snapshot_name) != snapshot_name or snapshot_name.startswith("."):
+            raise ValueError(f"Invalid snapshot name: {snapshot_name}")
+        return os.path.join(self.snapshot_dir, snapshot_name)
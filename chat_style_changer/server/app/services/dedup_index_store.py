@@ -0,0 +1,62 @@
+import json
+import os
+
+from app.config.config import settings
+from app.infra.file_lock import FileLock
+from app.services.deduplicator import DedupIndex
+
+
+class DedupIndexStore:
+    def __init__(
+        self,
+        index_dir: str = settings.DEDUP_INDEX_DIR,
+        max_hamming_distance: int = settings.DEDUP_SIMHASH_MAX_DISTANCE
+    ):
+        """
+        Initialize DedupIndexStore.
+
+        Each collection's dedup table maps normalized-message digests and SimHash
+        fingerprints to the primary key of the stored representative, so later
+        uploads add to its frequency instead of inserting another copy. Tables
+        are kept in one JSON file per collection.
+
+        Args:
+            index_dir: Directory where dedup tables are stored
+            max_hamming_distance: SimHash distance up to which messages are near-duplicates
+        """
+        self.index_dir = index_dir
+        self.max_hamming_distance = max_hamming_distance
+
+    def lock(self, collection_name: str) -> FileLock:
+        """Get the cross-process lock that serializes loads into a collection."""
+        return FileLock(f"{self._path(collection_name)}.lock")
+
+    def exists(self, collection_name: str) -> bool:
+        return os.path.exists(self._path(collection_name))
+
+    def load(self, collection_name: str) -> DedupIndex:
+        """Load the dedup table of a collection (empty if there is none)."""
+        path = self._path(collection_name)
+        if not os.path.exists(path):
+            return DedupIndex(self.max_hamming_distance)
+
+        with open(path, "r", encoding="utf-8") as f:
+            return DedupIndex.from_dict(json.load(f), self.max_hamming_distance)
+
+    def save(self, collection_name: str, index: DedupIndex):
+        """Persist the dedup table of a collection. The file is replaced atomically."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        path = self._path(collection_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def delete(self, collection_name: str):
+        """Remove the dedup table of a collection."""
+        path = self._path(collection_name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _path(self, collection_name: str) -> str:
+        return os.path.join(self.index_dir, f"{collection_name}.json")
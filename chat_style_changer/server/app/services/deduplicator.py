@@ -0,0 +1,203 @@
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from app.config.config import settings
+from app.models.message import Message
+
+# Runs of expressive characters only: standalone jamo (ㅋ, ㅎ, ㅠ, ㅜ, ...; conjoining after NFKC),
+# punctuation and emoji. Digits and letters are left alone so "1000원" and "100원" stay distinct.
+REPEAT_PATTERN = re.compile(r"([\u1100-\u11ff\u3131-\u318e~!?.,;^]|[\U0001F300-\U0001FAFF])\1{2,}")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a message for duplicate detection ("ㅋㅋㅋㅋㅋ" and "ㅋㅋ" become the same)."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = WHITESPACE_PATTERN.sub(" ", text).strip()
+    return REPEAT_PATTERN.sub(r"\1\1", text)
+
+
+def simhash(text: str, n: int = 2) -> int:
+    """64-bit SimHash over character n-grams."""
+    grams = [text[i:i + n] for i in range(max(1, len(text) - n + 1))]
+    hashes = np.frombuffer(
+        b"".join(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest() for gram in grams),
+        dtype=np.uint8
+    ).reshape(len(grams), SIMHASH_BITS // 8)
+    # Each bit votes +1 if set in a gram hash, -1 otherwise
+    bits = np.unpackbits(hashes, axis=1)
+    majority = bits.sum(axis=0) * 2 > len(grams)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def exact_key(normalized: str) -> str:
+    """Short digest of a normalized message used for exact-duplicate lookups."""
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class DedupIndex:
+    def __init__(self, max_hamming_distance: int = settings.DEDUP_SIMHASH_MAX_DISTANCE):
+        """
+        Lookup table from normalized messages to the id of their representative.
+
+        Exact duplicates are found by digest, near-duplicates by SimHash through
+        LSH bands. Ids are list positions while deduplicating an upload and
+        Milvus primary keys in the per-collection table.
+
+        Args:
+            max_hamming_distance: SimHash distance up to which messages are near-duplicates.
+                Must be below SIMHASH_BANDS so candidates always share a band.
+        """
+        if max_hamming_distance >= SIMHASH_BANDS:
+            raise ValueError(f"max_hamming_distance must be less than {SIMHASH_BANDS}")
+
+        self.max_hamming_distance = max_hamming_distance
+        self.exact: Dict[str, int] = {}
+        self.fingerprints: Dict[int, int] = {}
+        self.bands: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    def find(self, key: str, fingerprint: Optional[int]) -> Optional[int]:
+        """Get the representative id of an exact digest or, failing that, a near-duplicate fingerprint."""
+        id_ = self.exact.get(key)
+        if id_ is not None or fingerprint is None:
+            return id_
+
+        for band in range(SIMHASH_BANDS):
+            for candidate in self.bands.get((band, fingerprint >> (band * BAND_BITS) & BAND_MASK), []):
+                if bin(fingerprint ^ self.fingerprints[candidate]).count("1") <= self.max_hamming_distance:
+                    return candidate
+        return None
+
+    def add(self, key: str, fingerprint: Optional[int], id_: int):
+        """Register a message under a representative id."""
+        self.exact[key] = id_
+        if fingerprint is not None and id_ not in self.fingerprints:
+            self._add_fingerprint(fingerprint, id_)
+
+    def remap(self, ids: Dict[int, int]):
+        """Replace representative ids (e.g. after entities were re-inserted)."""
+        if not ids:
+            return
+        self.exact = {key: ids.get(id_, id_) for key, id_ in self.exact.items()}
+        self.fingerprints = {ids.get(id_, id_): fingerprint for id_, fingerprint in self.fingerprints.items()}
+        for band_ids in self.bands.values():
+            band_ids[:] = [ids.get(id_, id_) for id_ in band_ids]
+
+    def _add_fingerprint(self, fingerprint: int, id_: int):
+        self.fingerprints[id_] = fingerprint
+        for band in range(SIMHASH_BANDS):
+            self.bands[(band, fingerprint >> (band * BAND_BITS) & BAND_MASK)].append(id_)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "exact": self.exact,
+            "fingerprints": [[id_, fingerprint] for id_, fingerprint in self.fingerprints.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_hamming_distance: int = settings.DEDUP_SIMHASH_MAX_DISTANCE) -> "DedupIndex":
+        index = cls(max_hamming_distance)
+        index.exact = dict(data.get("exact", {}))
+        for id_, fingerprint in data.get("fingerprints", []):
+            index._add_fingerprint(fingerprint, id_)
+        return index
+
+    def __len__(self) -> int:
+        return len(set(self.exact.values()))
+
+
+class Deduplicator:
+    def __init__(
+        self,
+        max_hamming_distance: int = settings.DEDUP_SIMHASH_MAX_DISTANCE,
+        min_length: int = settings.DEDUP_SIMHASH_MIN_LENGTH
+    ):
+        """
+        Initialize Deduplicator.
+
+        Args:
+            max_hamming_distance: SimHash distance up to which messages are near-duplicates.
+                Must be below SIMHASH_BANDS so candidates always share a band.
+            min_length: Minimum normalized length for near-duplicate detection;
+                shorter messages are only deduplicated exactly
+        """
+        if max_hamming_distance >= SIMHASH_BANDS:
+            raise ValueError(f"max_hamming_distance must be less than {SIMHASH_BANDS}")
+
+        self.max_hamming_distance = max_hamming_distance
+        self.min_length = min_length
+
+    def keys(self, content: str) -> Tuple[str, Optional[int]]:
+        """Get the exact digest and, for long enough messages, the SimHash of a message."""
+        normalized = normalize_text(content)
+        fingerprint = simhash(normalized) if len(normalized) >= self.min_length else None
+        return exact_key(normalized), fingerprint
+
+    def new_index(self) -> DedupIndex:
+        return DedupIndex(self.max_hamming_distance)
+
+    def deduplicate(self, messages: List[Message]) -> Tuple[List[Message], float]:
+        """
+        Collapse exact and near-duplicate messages into representatives.
+
+        The first occurrence is kept as the representative and its `frequency`
+        is set to the number of messages it stands for.
+
+        Args:
+            messages: Messages to deduplicate
+
+        Returns:
+            Tuple of (representatives in original order, dedup ratio)
+        """
+        representatives: List[Message] = []
+        index = self.new_index()
+
+        for msg in messages:
+            key, fingerprint = self.keys(msg.content)
+            position = index.find(key, fingerprint)
+            if position is None:
+                position = len(representatives)
+                representatives.append(msg.model_copy(update={"frequency": 0}))
+            index.add(key, fingerprint, position)
+            representatives[position].frequency += msg.frequency
+
+        ratio = 1 - len(representatives) / len(messages) if messages else 0.0
+        return representatives, ratio
+
+    def match(
+        self,
+        representatives: List[Message],
+        index: DedupIndex
+    ) -> Tuple[List[Message], Dict[int, Message]]:
+        """
+        Match representatives of an upload against a collection's dedup table.
+
+        Args:
+            representatives: Output of `deduplicate`
+            index: The collection's table keyed by primary key
+
+        Returns:
+            Tuple of (messages not stored yet, {primary key: representative} for
+            messages whose stored representative should absorb their frequency)
+        """
+        new_messages: List[Message] = []
+        existing: Dict[int, Message] = {}
+        for msg in representatives:
+            key, fingerprint = self.keys(msg.content)
+            pk = index.find(key, fingerprint)
+            if pk is None:
+                new_messages.append(msg)
+            elif pk in existing:
+                existing[pk].frequency += msg.frequency
+            else:
+                existing[pk] = msg.model_copy()
+        return new_messages, existing
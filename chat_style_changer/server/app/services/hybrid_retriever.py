@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.config.config import settings
+from app.infra.async_vector_store import AsyncVectorStore
+from app.infra.lexical_index import LexicalIndexStore
+from app.infra.metrics import Metrics, metrics
+from app.models.message import Message
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_MODES = ("hybrid", "vector", "lexical")
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Tuple[Message, float]]],
+    top_k: int,
+    k: int = settings.HYBRID_RRF_K
+) -> List[Tuple[Message, float]]:
+    """
+    Fuse ranked result lists with reciprocal rank fusion.
+
+    Messages are matched across lists by (chatroom_id, timestamp, content).
+
+    Returns:
+        List of (Message, RRF score) pairs, best first
+    """
+    scores: Dict[Tuple, float] = defaultdict(float)
+    messages: Dict[Tuple, Message] = {}
+    for ranking in rankings:
+        for rank, (message, _) in enumerate(ranking, start=1):
+            key = (message.chatroom_id, message.timestamp, message.content)
+            scores[key] += 1 / (k + rank)
+            messages.setdefault(key, message)
+
+    best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+    return [(messages[key], score) for key, score in best]
+
+
+class HybridRetriever:
+    def __init__(
+        self,
+        vector_store: AsyncVectorStore,
+        lexical_store: LexicalIndexStore,
+        vector_timeout: float = settings.HYBRID_VECTOR_TIMEOUT,
+        metrics: Metrics = metrics
+    ):
+        """
+        Initialize HybridRetriever.
+
+        Args:
+            vector_store: AsyncVectorStore for dense retrieval
+            lexical_store: LexicalIndexStore for BM25 retrieval
+            vector_timeout: Seconds to wait for dense retrieval in hybrid mode before
+                serving lexical results only
+            metrics: Metrics registry where retrieval paths are recorded
+        """
+        self.vector_store = vector_store
+        self.lexical_store = lexical_store
+        self.vector_timeout = vector_timeout
+        self.metrics = metrics
+
+    async def search(
+        self,
+        query: str,
+        top_k: int,
+        collection_name: Optional[str],
+        mode: str = "hybrid"
+    ) -> List[Tuple[Message, float]]:
+        """
+        Retrieve messages similar to the query.
+
+        Args:
+            query: The search query string
+            top_k: Number of results to return
+            collection_name: Collection to search (the loaded collection)
+            mode: "vector" (dense only), "lexical" (BM25 only, no encoder call) or
+                "hybrid" (RRF of both; falls back to lexical when the vector search
+                is saturated, times out or fails)
+
+        Returns:
+            List of (Message, score) pairs, best first
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+
+        if mode == "vector":
+            self.metrics.increment("retrieval", "vector")
+            return await self.vector_store.search(query, top_k)
+
+        # get() may read and index new segments, so it runs in the thread too
+        lexical_results = await asyncio.to_thread(
+            self.lexical_store.search, collection_name, query, top_k
+        ) if collection_name else []
+
+        if mode == "lexical":
+            self.metrics.increment("retrieval", "lexical")
+            return lexical_results
+
+        if lexical_results and self.vector_store.is_search_saturated():
+            self.metrics.increment("retrieval", "lexical_fallback_saturated")
+            return lexical_results
+
+        try:
+            vector_results = await self.vector_store.search(
+                query, top_k, timeout=self.vector_timeout if lexical_results else None
+            )
+        except Exception as e:
+            if not lexical_results:
+                raise
+            logger.warning(f"Vector search failed, serving lexical results: {str(e) or type(e).__name__}")
+            self.metrics.increment("retrieval", "lexical_fallback_error")
+            return lexical_results
+
+        self.metrics.increment("retrieval", "hybrid")
+        return reciprocal_rank_fusion([vector_results, lexical_results], top_k)
@@ -0,0 +1,120 @@
+import logging
+from typing import Any, Callable, Optional, Tuple
+
+from app.config.config import settings
+from app.infra.llm import LLMService
+from app.infra.metrics import Metrics, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        llm_service: LLMService,
+        fast_model: str = settings.LLM_FAST_MODEL,
+        strong_model: str = settings.LLM_STRONG_MODEL,
+        long_input_chars: int = settings.LLM_LONG_INPUT_CHARS,
+        metrics: Metrics = metrics
+    ):
+        """
+        Initialize ModelRouter.
+
+        Args:
+            llm_service: LLMService used to call the models
+            fast_model: Model that every request is sent to first
+            strong_model: Model used when the fast model output fails validation
+            long_input_chars: Inputs at least this long go straight to the strong model
+            metrics: Metrics registry where routing decisions are recorded
+        """
+        self.llm_service = llm_service
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.long_input_chars = long_input_chars
+        self.metrics = metrics
+
+    def is_long_input(self, target: str) -> bool:
+        """Check whether the target sentence should skip the fast model."""
+        return len(target) >= self.long_input_chars
+
+    def generate(
+        self,
+        prompt: str,
+        input_: str,
+        target: str,
+        parse: Callable[[str], Any],
+        validate: Callable[[Any], None]
+    ) -> Tuple[Any, str]:
+        """
+        Generate a parsed response, escalating to the strong model when the fast
+        model output fails validation.
+
+        Validation only decides whether to escalate. The strong model's output is
+        returned as long as it parses, even if it fails validation.
+
+        Args:
+            prompt: System instructions
+            input_: Model input
+            target: Sentence being converted, used to flag long inputs
+            parse: Callable that parses the raw response or raises ValueError. It must also
+                reject responses of the wrong shape, since parsed strong-model output is returned
+            validate: Callable that checks a parsed response or raises ValueError
+
+        Returns:
+            Tuple of (parsed result, model name that produced it)
+
+        Raises:
+            ValueError: If the strong model response cannot be parsed
+        """
+        if self.fast_model and self.fast_model != self.strong_model:
+            if self.is_long_input(target):
+                self.metrics.increment("model_routing", "long_input_escalations")
+            else:
+                try:
+                    result = self._try_model(self.fast_model, prompt, input_, parse, validate)
+                except Exception as e:
+                    logger.warning(f"Fast model {self.fast_model} call failed: {str(e)}")
+                    self.metrics.increment("model_routing", "error_escalations")
+                else:
+                    if result is not None:
+                        self.metrics.increment("model_routing", "fast_model_success")
+                        logger.info(f"Model: {self.fast_model}")
+                        return result, self.fast_model
+                    self.metrics.increment("model_routing", "validation_escalations")
+
+        response = self.llm_service.generate_response(prompt, input_, model=self.strong_model)
+        try:
+            result = parse(response)
+        except ValueError:
+            self.metrics.increment("model_routing", "strong_model_failure")
+            raise
+
+        try:
+            validate(result)
+        except ValueError as e:
+            # Last resort: a parseable answer beats a hard failure
+            logger.warning(f"Validation failed for model {self.strong_model}, returning it anyway: {str(e)}")
+            self.metrics.increment("model_routing", "strong_model_unvalidated")
+        else:
+            self.metrics.increment("model_routing", "strong_model_success")
+
+        logger.info(f"Model: {self.strong_model}")
+        return result, self.strong_model
+
+    def _try_model(
+        self,
+        model: str,
+        prompt: str,
+        input_: str,
+        parse: Callable[[str], Any],
+        validate: Callable[[Any], None]
+    ) -> Optional[Any]:
+        response = self.llm_service.generate_response(prompt, input_, model=model)
+        try:
+            result = parse(response)
+            validate(result)
+            return result
+        except ValueError as e:
+            logger.warning(f"Validation failed for model {model}: {str(e)}")
+            logger.debug(f"Response: {response}")
+            return None
@@ -1,13 +1,18 @@
 import json
 import textwrap
-from typing import List
+from typing import List, Optional
 
+from app.config.config import settings
 from app.infra.llm import LLMService
 from app.models.message import Message
+from app.models.style_profile import StyleProfile
+from app.services.model_router import ModelRouter
 
 
 class SpeechStyleConverter:
-    def __init__(self, llm_service: LLMService):
+    MOOD_COUNT = 3
+
+    def __init__(self, llm_service: LLMService, model_router: Optional[ModelRouter] = None):
         PROMPT_1 = textwrap.dedent(
             """\
             당신은 유저의 평소 말투를 반영해 주어진 문장을 유저의 말투대로 변경해주는 서비스입니다.
@@ -61,6 +66,7 @@ class SpeechStyleConverter:
         )
 
         self.llm_service = llm_service
+        self.model_router = model_router or ModelRouter(llm_service)
         self.prompt = PROMPT_2
     
     def _create_input(self,
@@ -88,10 +94,28 @@ class SpeechStyleConverter:
             """
         )
     
+    def _create_prompt(self, style_profile: Optional[StyleProfile]) -> str:
+        # 스타일 프로필은 컬렉션마다 고정이므로 instructions 뒤에 붙여
+        # 요청 간에 동일한 prefix가 되도록 합니다 (provider 프롬프트 캐시 활용).
+        if style_profile is None:
+            return self.prompt
+
+        formatted_exemplars = "\n\n".join(style_profile.exemplars)
+        return (
+            f"{self.prompt}\n"
+            f"[🗂 유저 말투 프로필]\n"
+            f"- 자주 쓰는 문장 끝 표현: {', '.join(style_profile.endings)}\n"
+            f"- 자주 쓰는 이모지: {' '.join(style_profile.top_emojis)}\n"
+            f"- 웃음 표현(ㅋㅋ, ㅎㅎ) 사용 비율: {style_profile.laughter_ratio:.0%}\n"
+            f"- 대표 발화 예시:\n"
+            f"{formatted_exemplars}\n"
+        )
+
     def convert(self,
                 context_messages: List[Message],
                 target_sentence: str,
-                similar_utterances: List[str]) -> dict:
+                similar_utterances: List[str],
+                style_profile: Optional[StyleProfile] = None) -> dict:
         """
         주어진 문장을 유저의 말투로 변환합니다.
         
@@ -99,6 +123,7 @@ class SpeechStyleConverter:
             context_messages: 이전 대화 문맥
             target_sentence: 변환할 대상 문장
             similar_utterances: 유사도가 높은 유저의 평소 발화 목록
+            style_profile: 컬렉션의 스타일 프로필 (있으면 프롬프트 prefix로 사용)
             
         Returns:
             str: 변환된 문장
@@ -109,10 +134,31 @@ class SpeechStyleConverter:
             similar_utterances=similar_utterances
         )
 
-        print(f"Prompt: {self.prompt}")
+        prompt = self._create_prompt(style_profile)
+
+        print(f"Prompt: {prompt}")
         print(f"Input: {input_}")
         
-        response = self.llm_service.generate_response(self.prompt, input_)
+        parsed, _ = self.model_router.generate(
+            prompt=prompt,
+            input_=input_,
+            target=target_sentence,
+            parse=self._parse,
+            validate=lambda parsed: self._validate(parsed, target_sentence)
+        )
+
+        return parsed
+
+    def _parse(self, response: str) -> dict:
+        """
+        LLM 응답을 JSON으로 파싱합니다.
+
+        검증에 실패해도 강한 모델의 응답은 그대로 반환되므로, 분위기별 문장을
+        담은 객체 형태인지는 여기서 확인합니다.
+
+        Raises:
+            ValueError: JSON으로 파싱할 수 없거나 문자열 값을 가진 객체가 아닌 경우
+        """
         try:
             parsed = json.loads(response)
         except json.JSONDecodeError as e:
@@ -120,4 +166,30 @@ class SpeechStyleConverter:
             print("응답 원문:", response)
             raise ValueError("LLM 응답을 JSON으로 파싱할 수 없습니다.")
 
-        return parsed
\ No newline at end of file
+        if not isinstance(parsed, dict) or not parsed or not all(isinstance(v, str) for v in parsed.values()):
+            raise ValueError("LLM 응답은 분위기별 변환 문장을 문자열 값으로 담은 JSON 객체여야 합니다.")
+        return parsed
+
+    def _validate(self, parsed: dict, target_sentence: str) -> None:
+        """
+        파싱된 LLM 응답을 검증합니다.
+
+        정확히 세 가지 분위기를 포함해야 하며, 각 변환 문장의 길이가
+        원문 길이 기준 허용 범위 안에 있어야 합니다.
+
+        Raises:
+            ValueError: 검증에 실패한 경우
+        """
+        if not isinstance(parsed, dict) or len(parsed) != self.MOOD_COUNT:
+            raise ValueError(f"LLM 응답은 {self.MOOD_COUNT}가지 분위기를 포함해야 합니다.")
+
+        min_length = max(1, int(len(target_sentence) * settings.LLM_MIN_LENGTH_RATIO))
+        max_length = max(
+            int(len(target_sentence) * settings.LLM_MAX_LENGTH_RATIO),
+            len(target_sentence) + 20
+        )
+        for mood, sentence in parsed.items():
+            if not isinstance(sentence, str):
+                raise ValueError(f"'{mood}' 분위기의 변환 결과가 문자열이 아닙니다.")
+            if not min_length <= len(sentence.strip()) <= max_length:
+                raise ValueError(f"'{mood}' 분위기의 변환 결과 길이가 허용 범위를 벗어났습니다.")
@@ -0,0 +1,235 @@
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from app.config.config import settings
+from app.infra.vector_store import VectorStore
+from app.models.style_profile import StyleProfile
+
+logger = logging.getLogger(__name__)
+
+LAUGHTER_PATTERN = re.compile(r"[ㅋㅎ]{2,}")
+EMOJI_PATTERN = re.compile(
+    "[\U0001F300-\U0001FAFF\U00002600-\U000027BF\U0001F000-\U0001F2FF]"
+)
+
+
+def mini_batch_kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    batch_size: int = 256,
+    n_iter: int = 100,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Cluster L2-normalized vectors with spherical mini-batch k-means (Sculley, 2010).
+
+    Args:
+        vectors: (n, dim) array of normalized embeddings
+        n_clusters: Number of clusters
+        batch_size: Number of samples per update step
+        n_iter: Number of update steps
+        seed: Random seed
+
+    Returns:
+        (n_clusters, dim) array of cluster centers
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    centers = vectors[rng.choice(n, size=n_clusters, replace=False)].copy()
+    counts = np.zeros(n_clusters, dtype=np.int64)
+
+    for _ in range(n_iter):
+        batch = vectors[rng.choice(n, size=min(batch_size, n), replace=False)]
+        labels = np.argmax(batch @ centers.T, axis=1)
+        for label in np.unique(labels):
+            members = batch[labels == label]
+            counts[label] += len(members)
+            rate = len(members) / counts[label]
+            centers[label] = (1 - rate) * centers[label] + rate * members.mean(axis=0)
+        # Keep centers on the unit sphere so dot-product assignment is not biased by norm
+        centers /= np.maximum(np.linalg.norm(centers, axis=1, keepdims=True), 1e-12)
+
+    return centers
+
+
+class StyleProfiler:
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        profile_dir: str = settings.STYLE_PROFILE_DIR,
+        rebuild_growth: float = settings.STYLE_PROFILE_REBUILD_GROWTH
+    ):
+        """
+        Initialize StyleProfiler.
+
+        Args:
+            vector_store: VectorStore to read collection embeddings from
+            profile_dir: Directory where profiles are cached as JSON files
+            rebuild_growth: Fraction by which a collection must grow before
+                `refresh` rebuilds its profile
+        """
+        self.vector_store = vector_store
+        self.profile_dir = profile_dir
+        self.rebuild_growth = rebuild_growth
+        # collection name -> (profile file mtime, profile)
+        self._profiles: Dict[str, Tuple[float, StyleProfile]] = {}
+        self._building: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def refresh(self, collection_name: str) -> Optional[StyleProfile]:
+        """
+        Rebuild the style profile if the collection has grown enough since it was built.
+
+        Returns:
+            The rebuilt profile, or None if it was still fresh or already being rebuilt
+        """
+        with self._lock:
+            if collection_name in self._building:
+                return None
+            self._building.add(collection_name)
+
+        try:
+            profile = self.get(collection_name)
+            collection_size = self.vector_store.get_count(collection_name)
+            if profile is not None and collection_size < profile.collection_size * (1 + self.rebuild_growth):
+                return None
+            return self.build(collection_name, collection_size)
+        finally:
+            with self._lock:
+                self._building.discard(collection_name)
+
+    def build(self, collection_name: str, collection_size: Optional[int] = None) -> StyleProfile:
+        """Build, cache and persist the style profile of a collection from a random sample."""
+        if collection_size is None:
+            collection_size = self.vector_store.get_count(collection_name)
+
+        contents: List[str] = []
+        frequencies: List[int] = []
+        embeddings: List[np.ndarray] = []
+        for batch_messages, batch_embeddings in self.vector_store.sample_vectors(
+            collection_name, settings.STYLE_PROFILE_MAX_SAMPLES
+        ):
+            contents.extend(msg.content for msg in batch_messages)
+            frequencies.extend(msg.frequency for msg in batch_messages)
+            embeddings.append(batch_embeddings)
+
+        if not contents:
+            raise ValueError(f"Collection {collection_name} is empty")
+
+        profile = StyleProfile(
+            collection_name=collection_name,
+            message_count=len(contents),
+            collection_size=collection_size,
+            exemplars=self._select_exemplars(contents, np.concatenate(embeddings)),
+            endings=self._top_endings(contents, frequencies),
+            top_emojis=self._top_emojis(contents, frequencies),
+            laughter_ratio=round(
+                sum(
+                    frequency for content, frequency in zip(contents, frequencies)
+                    if LAUGHTER_PATTERN.search(content)
+                ) / sum(frequencies),
+                3
+            ),
+            created_at=datetime.now()
+        )
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = self._path(collection_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(profile.model_dump_json())
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._profiles[collection_name] = (os.stat(path).st_mtime, profile)
+
+        logger.info(f"Built style profile for {collection_name} from {len(contents)} messages")
+        return profile
+
+    def get(self, collection_name: Optional[str]) -> Optional[StyleProfile]:
+        """
+        Get the style profile of a collection, if one has been built.
+
+        The in-memory copy is reused until the profile file changes, so profiles
+        rebuilt by other workers are picked up.
+        """
+        if collection_name is None:
+            return None
+
+        path = self._path(collection_name)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            with self._lock:
+                self._profiles.pop(collection_name, None)
+            return None
+
+        with self._lock:
+            cached = self._profiles.get(collection_name)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+        with open(path, "r", encoding="utf-8") as f:
+            profile = StyleProfile.model_validate_json(f.read())
+        with self._lock:
+            self._profiles[collection_name] = (mtime, profile)
+        return profile
+
+    def delete(self, collection_name: str):
+        """Remove the cached style profile of a collection."""
+        with self._lock:
+            self._profiles.pop(collection_name, None)
+        path = self._path(collection_name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _path(self, collection_name: str) -> str:
+        return os.path.join(self.profile_dir, f"{collection_name}.json")
+
+    def _select_exemplars(self, contents: List[str], vectors: np.ndarray) -> List[str]:
+        """Pick the utterances closest to each cluster center."""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+
+        n_clusters = min(settings.STYLE_PROFILE_CLUSTERS, len(contents))
+        centers = mini_batch_kmeans(vectors, n_clusters)
+        similarities = vectors @ centers.T
+        labels = np.argmax(similarities, axis=1)
+
+        exemplars = []
+        for cluster in range(n_clusters):
+            members = np.flatnonzero(labels == cluster)
+            if len(members) == 0:
+                continue
+            ranked = members[np.argsort(-similarities[members, cluster])]
+            for index in ranked[:settings.STYLE_PROFILE_EXEMPLARS_PER_CLUSTER]:
+                exemplars.append(contents[index])
+
+        return exemplars
+
+    def _top_endings(self, contents: List[str], frequencies: List[int], n: int = 10) -> List[str]:
+        """
+        Get the most frequent sentence endings (last two characters of each line).
+
+        Stored messages are deduplicated representatives, so each counts `frequency` times.
+        """
+        endings = Counter()
+        for content, frequency in zip(contents, frequencies):
+            for line in content.splitlines():
+                line = line.strip()
+                if len(line) >= 2:
+                    endings[line[-2:]] += frequency
+        return [ending for ending, _ in endings.most_common(n)]
+
+    def _top_emojis(self, contents: List[str], frequencies: List[int], n: int = 5) -> List[str]:
+        """Get the most frequent emojis, counting each message `frequency` times."""
+        emojis = Counter()
+        for content, frequency in zip(contents, frequencies):
+            for emoji in EMOJI_PATTERN.findall(content):
+                emojis[emoji] += frequency
+        return [emoji for emoji, _ in emojis.most_common(n)]
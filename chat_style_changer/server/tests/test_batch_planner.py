@@ -0,0 +1,40 @@
+from app.services.batch_planner import BatchPlan, BatchPlanner
+
+
+def test_plan_groups_similar_lengths_under_token_budget():
+    lengths = [50, 3, 48, 4, 5, 2]
+    plan = BatchPlanner(max_tokens=100, max_batch_size=10).plan(lengths)
+
+    assert plan.batches == [[1, 3, 4, 5], [0, 2]]
+    for batch in plan.batches:
+        assert len(batch) * max(lengths[i] for i in batch) <= 100
+
+
+def test_plan_keeps_original_order_inside_a_batch():
+    plan = BatchPlanner(max_tokens=1000, max_batch_size=10).plan([9, 1, 5])
+
+    assert plan.batches == [[0, 1, 2]]
+
+
+def test_plan_respects_max_batch_size():
+    plan = BatchPlanner(max_tokens=1000, max_batch_size=2).plan([1] * 5)
+
+    assert [len(batch) for batch in plan.batches] == [2, 2, 1]
+    assert sorted(i for batch in plan.batches for i in batch) == list(range(5))
+
+
+def test_plan_puts_oversized_message_in_its_own_batch():
+    plan = BatchPlanner(max_tokens=10, max_batch_size=10).plan([2, 50, 3])
+
+    assert plan.batches == [[0, 2], [1]]
+
+
+def test_plan_of_no_messages():
+    plan = BatchPlanner(max_tokens=100, max_batch_size=10).plan([])
+
+    assert plan.batches == []
+    assert plan.padding_efficiency == 1.0
+
+
+def test_padding_efficiency():
+    assert BatchPlan([[0, 1]], [2, 4]).padding_efficiency == 6 / 8
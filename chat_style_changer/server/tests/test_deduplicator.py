@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from app.models.message import Message
+from app.services.deduplicator import DedupIndex, Deduplicator, normalize_text
+
+
+def message(content: str, frequency: int = 1) -> Message:
+    return Message(chatroom_id=1, timestamp=datetime(2024, 1, 1), content=content, frequency=frequency)
+
+
+def test_normalize_text_shortens_laughter_and_punctuation():
+    assert normalize_text("ㅋㅋㅋㅋㅋ") == normalize_text("ㅋㅋ")
+    assert normalize_text("ㅠㅠㅠㅠ 진짜?!!!!") == normalize_text("ㅠㅠ 진짜?!!")
+    assert normalize_text("좋아~~~~") == normalize_text("좋아~~")
+
+
+def test_normalize_text_keeps_digits_and_letters():
+    assert normalize_text("1000원 보내줘") != normalize_text("100원 보내줘")
+    assert normalize_text("zzz") != normalize_text("zz")
+
+
+def test_deduplicate_keeps_messages_with_different_amounts():
+    representatives, ratio = Deduplicator().deduplicate([message("1000원 보내줘"), message("100원 보내줘")])
+
+    assert [msg.content for msg in representatives] == ["1000원 보내줘", "100원 보내줘"]
+    assert [msg.frequency for msg in representatives] == [1, 1]
+    assert ratio == 0.0
+
+
+def test_deduplicate_sums_frequencies_into_first_occurrence():
+    representatives, ratio = Deduplicator().deduplicate(
+        [message("ㅋㅋㅋㅋ"), message("배고파"), message("ㅋㅋ", frequency=2), message("  배고파 ")]
+    )
+
+    assert [(msg.content, msg.frequency) for msg in representatives] == [("ㅋㅋㅋㅋ", 3), ("배고파", 2)]
+    assert ratio == 0.5
+
+
+def test_deduplicate_folds_near_duplicates():
+    deduplicator = Deduplicator(max_hamming_distance=3, min_length=10)
+    text = "오늘 회의는 세 시에 시작하니까 늦지 말고 와줘 알았지"
+    representatives, _ = deduplicator.deduplicate([message(text), message(text + "?")])
+
+    assert len(representatives) == 1
+    assert representatives[0].frequency == 2
+
+
+def test_match_splits_new_and_stored_messages():
+    deduplicator = Deduplicator()
+    index = deduplicator.new_index()
+    index.add(*deduplicator.keys("안녕"), 42)
+
+    new_messages, existing = deduplicator.match([message("안녕", 2), message("잘 자")], index)
+
+    assert [msg.content for msg in new_messages] == ["잘 자"]
+    assert list(existing) == [42]
+    assert existing[42].frequency == 2
+
+
+def test_dedup_index_remap_and_round_trip():
+    deduplicator = Deduplicator(max_hamming_distance=3, min_length=1)
+    index = deduplicator.new_index()
+    key, fingerprint = deduplicator.keys("내일 봐요")
+    index.add(key, fingerprint, 1)
+    index.remap({1: 7})
+
+    restored = DedupIndex.from_dict(index.to_dict(), max_hamming_distance=3)
+    assert restored.find(key, fingerprint) == 7
+    assert restored.find("missing", fingerprint) == 7
+    assert len(restored) == 1
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pymilvus")
+
+from app.models.message import Message
+from app.services.hybrid_retriever import reciprocal_rank_fusion
+
+
+def message(content: str) -> Message:
+    return Message(chatroom_id=1, timestamp=datetime(2024, 1, 1), content=content)
+
+
+def test_reciprocal_rank_fusion_prefers_messages_ranked_by_both():
+    vector = [(message("a"), 0.9), (message("b"), 0.8)]
+    lexical = [(message("b"), 5.0), (message("c"), 4.0)]
+
+    fused = reciprocal_rank_fusion([vector, lexical], top_k=3, k=60)
+
+    assert [msg.content for msg, _ in fused] == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def test_reciprocal_rank_fusion_truncates_to_top_k():
+    ranking = [(message(str(i)), 1.0) for i in range(5)]
+
+    assert len(reciprocal_rank_fusion([ranking], top_k=2)) == 2
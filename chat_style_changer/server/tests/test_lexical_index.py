@@ -0,0 +1,88 @@
+import threading
+from datetime import datetime
+
+from app.infra.lexical_index import LexicalIndex, LexicalIndexStore, char_ngrams
+from app.models.message import Message
+
+
+def message(content: str) -> Message:
+    return Message(chatroom_id=1, timestamp=datetime(2024, 1, 1), content=content)
+
+
+def test_char_ngrams_mark_token_boundaries():
+    assert char_ngrams("밥 먹") == ["\x02밥", "밥\x03", "\x02먹", "먹\x03"]
+    assert char_ngrams("   ") == []
+
+
+def test_index_matches_emoji_after_space():
+    index = LexicalIndex()
+    index.add([message("고마워 😊"), message("고마워")])
+
+    results = index.search("😊", top_k=5)
+    assert [msg.content for msg, _ in results] == ["고마워 😊"]
+
+
+def test_index_matches_short_tokens():
+    index = LexicalIndex()
+    index.add([message("밥 먹었어?"), message("밥 먹"), message("오늘 날씨 좋다")])
+
+    results = index.search("밥 먹", top_k=5)
+    assert [msg.content for msg, _ in results][0] == "밥 먹"
+    assert "오늘 날씨 좋다" not in [msg.content for msg, _ in results]
+
+
+def test_index_search_on_empty_index():
+    assert LexicalIndex().search("ㅋㅋ") == []
+
+
+def test_store_picks_up_segments_written_by_other_workers(tmp_path):
+    worker_a = LexicalIndexStore(str(tmp_path))
+    worker_b = LexicalIndexStore(str(tmp_path))
+    assert len(worker_b.get("c")) == 0
+
+    worker_a.add("c", [message("안녕하세요")])
+    worker_b.add("c", [message("잘 자요")])
+
+    assert len(worker_a.get("c")) == 2
+    assert len(worker_b.get("c")) == 2
+
+
+def test_store_reloads_after_rebuild(tmp_path):
+    worker_a = LexicalIndexStore(str(tmp_path))
+    worker_b = LexicalIndexStore(str(tmp_path))
+    worker_a.add("c", [message("하나"), message("둘")])
+    assert len(worker_b.get("c")) == 2
+
+    assert worker_b.rebuild("c", [[message("셋")]]) == 1
+    assert [msg.content for msg in worker_a.get("c").messages] == ["셋"]
+
+
+def test_store_add_backfills_only_missing_index(tmp_path):
+    store = LexicalIndexStore(str(tmp_path))
+    store.add("c", [message("새 메시지")], lambda: [[message("예전 메시지")]])
+    store.add("c", [message("다음 메시지")], lambda: [[message("다시 읽으면 안 됨")]])
+
+    assert sorted(msg.content for msg in store.get("c").messages) == ["다음 메시지", "새 메시지", "예전 메시지"]
+
+
+def test_store_add_does_not_index_segment_twice_when_get_races(tmp_path):
+    store = LexicalIndexStore(str(tmp_path))
+    write_segment = store._write_segment
+    readers = []
+
+    def write_segment_and_read(collection_name, messages):
+        segment = write_segment(collection_name, messages)
+        # A concurrent request loads the collection as soon as the segment is visible
+        reader = threading.Thread(target=store.get, args=(collection_name,))
+        reader.start()
+        # Give it the chance to finish before add() registers the segment
+        reader.join(timeout=0.2)
+        readers.append(reader)
+        return segment
+
+    store._write_segment = write_segment_and_read
+    store.add("c", [message("첫 번째"), message("두 번째")])
+    for reader in readers:
+        reader.join()
+
+    assert len(store.get("c")) == 2
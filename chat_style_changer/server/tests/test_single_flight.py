@@ -0,0 +1,32 @@
+import asyncio
+
+from app.infra.metrics import Metrics
+from app.infra.single_flight import SingleFlight
+
+
+def test_caller_arriving_after_last_waiter_cancels_starts_new_flight():
+    async def scenario():
+        flight = SingleFlight("test", metrics=Metrics())
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        t1 = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+        t1.cancel()
+        # t2 joins before the cancelled computation has finished unwinding
+        t2 = asyncio.create_task(flight.do("key", compute))
+
+        try:
+            await t1
+        except asyncio.CancelledError:
+            pass
+        return await t2, calls
+
+    result, calls = asyncio.run(scenario())
+    assert result == 2
+    assert calls == 2
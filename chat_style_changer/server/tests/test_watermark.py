@@ -0,0 +1,59 @@
+import threading
+from datetime import datetime
+
+from app.infra.watermark_store import WatermarkStore
+from app.models.message import Message
+from app.models.watermark import Watermark
+
+
+def message(second: int, content: str = "msg", chatroom_id: int = 1) -> Message:
+    return Message(chatroom_id=chatroom_id, timestamp=datetime(2024, 1, 1, 0, 0, second), content=content)
+
+
+def test_covers_messages_before_and_at_the_mark():
+    watermark = Watermark(timestamp=datetime(2024, 1, 1)).advance(message(5, "a"))
+
+    assert watermark.covers(message(4, "anything"))
+    assert watermark.covers(message(5, "a"))
+    assert not watermark.covers(message(5, "b"))
+    assert not watermark.covers(message(6, "a"))
+
+
+def test_advance_keeps_every_message_of_the_latest_second():
+    watermark = Watermark(timestamp=datetime(2024, 1, 1))
+    for msg in [message(5, "a"), message(5, "b"), message(3, "old")]:
+        watermark = watermark.advance(msg)
+
+    assert watermark.timestamp == datetime(2024, 1, 1, 0, 0, 5)
+    assert len(watermark.content_hashes) == 2
+    assert watermark.advance(message(5, "a")) == watermark
+
+    later = watermark.advance(message(6, "c"))
+    assert later.covers(message(5, "b"))
+    assert len(later.content_hashes) == 1
+
+
+def test_store_commits_per_chatroom(tmp_path):
+    store = WatermarkStore(str(tmp_path))
+    store.commit("c", [message(1, chatroom_id=1), message(2, chatroom_id=2)])
+
+    assert store.get("c", 1).timestamp == datetime(2024, 1, 1, 0, 0, 1)
+    assert store.get("c", 2).timestamp == datetime(2024, 1, 1, 0, 0, 2)
+    assert store.get("other", 1) is None
+
+    store.delete("c")
+    assert store.get("c", 1) is None
+
+
+def test_concurrent_commits_from_separate_stores_are_not_lost(tmp_path):
+    def commit(chatroom_id: int):
+        WatermarkStore(str(tmp_path)).commit("c", [message(1, chatroom_id=chatroom_id)])
+
+    threads = [threading.Thread(target=commit, args=(chatroom_id,)) for chatroom_id in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = WatermarkStore(str(tmp_path))
+    assert all(store.get("c", chatroom_id) is not None for chatroom_id in range(10))